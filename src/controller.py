@@ -16,18 +16,24 @@ Key functionalities:
 Main dependencies:
     - `fuzzy_ui`: The user interface module from this project.
     - `data_model`: The data model module from this project.
+    - `concurrent.futures`: for running fuzzy matching and file operations on a worker thread, so the UI doesn't freeze.
 
 Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
 """
 
 import logging
 import logging_utils
-from typing import Callable, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Tuple
 from fuzzy_ui import FuzzyUI
 from data_model import DataModel
 
 logger = logging.getLogger(__name__)
 
+# How often (in milliseconds) the mainloop checks whether a background task has finished
+_BACKGROUND_TASK_POLL_INTERVAL_MS = 50
+
 
 class Controller:
     """
@@ -37,10 +43,15 @@ class Controller:
     Attributes:
         - `user_interface`: An instance of the `FuzzyUI` class to manage the user interface.
         - `data_model`: An instance of the `DataModel` class to manage and process the data.
+        - `background_executor`: A single worker thread for running slow tasks, such as fuzzy matching and file operations, off the UI thread.
+        - `running_background_tasks`: The number of background tasks that haven't finished yet.
 
     Methods:
         - `setup_UI_bindings`: Binds UI components to their respective handler functions.
         - `run`: Starts the main loop of the application.
+        - `run_in_background`: Runs a slow task on a worker thread, and calls back on the UI thread once it finishes.
+        - `check_background_task`: Checks whether a background task has finished, and calls back if it has.
+        - `show_exception`: Logs the exception being handled and shows it to the user.
         - `fuzzy_match_logic`: Handles the logic for initiating a fuzzy match based on user input.
         - `categorize_selected_responses`: Categorizes user-selected responses into selected categories.
         - `recategorize_selected_responses`: Recategorizes user-selected responses into new categories.
@@ -77,6 +88,10 @@ class Controller:
 
         self.user_interface = user_interface
         self.data_model = data_model
+        self.background_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="background_task"
+        )
+        self.running_background_tasks = 0
 
         self.setup_UI_bindings()
 
@@ -139,6 +154,81 @@ class Controller:
         logger.info("Starting the app mainloop")
         self.user_interface.mainloop()
 
+    def run_in_background(
+        self,
+        task: Callable,
+        *args: Any,
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None] | None = None,
+    ) -> None:
+        """
+        Runs a slow task, such as a fuzzy match or reading or writing a file, on a worker thread and returns straight away,
+        so the mainloop keeps redrawing the UI. Once the task has finished, `on_done` is called on the UI thread.
+
+        The buttons, entries, slider and checkbox ignore input until the task has finished,
+        so the data model can't be changed part way through the task.
+
+        Args:
+            task (Callable): The function to run.
+            *args (Any): The arguments to pass to the function.
+            on_done (Callable[[Any], None]): Called with the return value of the task.
+            on_error (Callable[[Exception], None] | None): Called with any exception raised by the task or by `on_done`,
+                while it is being handled. If None, the exception is raised to tkinter, which logs it.
+        """
+
+        future = self.background_executor.submit(task, *args)
+        if self.running_background_tasks == 0:
+            self.user_interface.hold_busy()
+        self.running_background_tasks += 1
+        self.user_interface.after(
+            _BACKGROUND_TASK_POLL_INTERVAL_MS, self.check_background_task, future, on_done, on_error
+        )
+
+    def check_background_task(
+        self,
+        future: Future,
+        on_done: Callable[[Any], None],
+        on_error: Callable[[Exception], None] | None,
+    ) -> None:
+        """
+        Checks whether a task started by `run_in_background` has finished. If it has, input is taken again
+        and `on_done` (or `on_error`) is called, otherwise it checks again later.
+
+        Args:
+            future (Future): The running task.
+            on_done (Callable[[Any], None]): Called with the return value of the task.
+            on_error (Callable[[Exception], None] | None): Called with any exception raised by the task or by `on_done`.
+        """
+
+        if not future.done():
+            self.user_interface.after(
+                _BACKGROUND_TASK_POLL_INTERVAL_MS, self.check_background_task, future, on_done, on_error
+            )
+            return
+
+        self.running_background_tasks -= 1
+        if self.running_background_tasks == 0:
+            self.user_interface.release_busy()
+
+        try:
+            on_done(future.result())
+        except Exception as e:
+            if on_error is None:
+                raise
+            on_error(e)
+
+    def show_exception(self, message: str, error: Exception) -> None:
+        """
+        Logs the exception being handled and shows it to the user.
+
+        Args:
+            message (str): What failed, shown before the exception.
+            error (Exception): The exception.
+        """
+
+        logger.exception("")
+        self.user_interface.show_error(f"{message}: {error}")
+
     ### ----------------------- Main Functionality ----------------------- ###
     def fuzzy_match_logic(self) -> None:
         """
@@ -149,8 +239,11 @@ class Controller:
         logger.info("Getting string entry")
         string_to_match = self.user_interface.match_string_entry.get()
         logger.info(f'Calling data model to fuzzy match: "{string_to_match}"')
-        self.data_model.fuzzy_match_logic(string_to_match)
-        self.display_fuzzy_match_results()
+        self.run_in_background(
+            self.data_model.fuzzy_match_logic,
+            string_to_match,
+            on_done=lambda result: self.display_fuzzy_match_results(),
+        )
 
     def categorize_selected_responses(self) -> None:
         """
@@ -165,7 +258,7 @@ class Controller:
 
         if not categories or not responses:
             logger.warning("Both a category and response must be selected to categorize")
-            logger.debug(f"selected categories:{categories}, selected responses:{responses}")
+            logger.debug("selected categories:%s, selected responses:%s", categories, responses)
             self.user_interface.show_warning(
                 "Please select both a category and responses to categorize."
             )
@@ -173,7 +266,7 @@ class Controller:
 
         if categorization_type == "Single" and len(categories) > 1:
             logger.warning("Only one category can be selected in Single Categorization mode.")
-            logger.debug(f"selected categories:{categories}")
+            logger.debug("selected categories:%s", categories)
             self.user_interface.show_warning(
                 "Only one category can be selected in Single Categorization mode.",
             )
@@ -204,7 +297,7 @@ class Controller:
             logger.warning(
                 "Both a category and response from the category results display must be selected to categorize"
             )
-            logger.debug(f"selected categories:{categories}, selected responses:{responses}")
+            logger.debug("selected categories:%s, selected responses:%s", categories, responses)
             self.user_interface.show_warning(
                 "Please select both a category and responses in the category results display to categorize.",
             )
@@ -212,7 +305,7 @@ class Controller:
 
         if self.user_interface.categorization_type.get() == "Single" and len(categories) > 1:
             logger.warning("Only one category can be selected in Single Categorization mode.")
-            logger.debug(f"selected categories:{categories}")
+            logger.debug("selected categories:%s", categories)
             self.user_interface.show_warning(
                 "Only one category can be selected in Single Categorization mode.",
             )
@@ -263,13 +356,13 @@ class Controller:
 
         if len(selected_categories) != 1:
             logger.warning("One category to be renamed has not been selected")
-            logger.debug(f"selected_categories: {selected_categories}")
+            logger.debug("selected_categories: %s", selected_categories)
             self.user_interface.show_warning("Please select one category to rename.")
             return
 
         if "Uncategorized" in selected_categories:
             logger.warning('Category "Uncategorized" cannot be renamed')
-            logger.debug(f"selected_categories: {selected_categories}")
+            logger.debug("selected_categories: %s", selected_categories)
             self.user_interface.show_warning(
                 'You may not rename the category "Uncategorized".',
             )
@@ -290,7 +383,7 @@ class Controller:
         )
         self.user_interface.cancel_button.bind(
             "<Button-1>",
-            lambda event: self.user_interface.rename_dialog_popup.destroy(),
+            lambda event: self.user_interface.close_rename_category_popup(),
         )
 
     def on_rename_category_entry(self) -> None:
@@ -305,7 +398,7 @@ class Controller:
 
         if not new_category:
             logger.error("New category entry must be non-empty")
-            logger.debug(f'new_category: "{new_category}"')
+            logger.debug('new_category: "%s"', new_category)
             self.user_interface.show_error("Please enter a non-empty category name.")
             return
 
@@ -315,7 +408,7 @@ class Controller:
         success, message = self.data_model.rename_category(old_category, new_category)
 
         if success:
-            self.user_interface.rename_dialog_popup.destroy()
+            self.user_interface.close_rename_category_popup()
             self.display_categories()
             self.display_category_results()
         else:
@@ -332,13 +425,13 @@ class Controller:
 
         if not selected_categories:
             logger.warning("No categories selected to delete")
-            logger.debug(f"Selected categories: {selected_categories}")
+            logger.debug("Selected categories: %s", selected_categories)
             self.user_interface.show_warning("Please select categories to delete.")
             return
 
         if "Uncategorized" in selected_categories:
             logger.warning('Category "Uncategorized" cannot be deleted')
-            logger.debug(f"selected_categories: {selected_categories}")
+            logger.debug("selected_categories: %s", selected_categories)
             self.user_interface.show_warning(
                 'You may not delete the category "Uncategorized".',
             )
@@ -366,22 +459,26 @@ class Controller:
         Populates the data structures for the new project and updates the UI with the results.
         """
 
+        def on_imported() -> None:
+            self.populate_data_structures_on_new_project()
+            self.refresh_treeviews()
+            self.user_interface.show_info("Data imported successfully")
+            self.ask_categorization_type()
+            logger.info("New project setup successfully")
+
         logger.info("Starting new project")
+        on_error = partial(self.show_exception, "Failed to initialize new project")
         try:
-            if self.file_import_logic(
+            self.file_import_logic(
                 file_types=[("CSV files", "*.csv"), ("XLSX files", "*.xlsx"), ("All files", "*.*")],
                 title="Please select a file containing your dataset",
                 data_model_method=self.data_model.file_import_on_new_project,
-            ):
-                self.populate_data_structures_on_new_project()
-                self.refresh_treeviews()
-                self.user_interface.show_info("Data imported successfully")
-                self.ask_categorization_type()
-                logger.info("New project setup successfully")
+                on_imported=on_imported,
+                on_error=on_error,
+            )
 
         except Exception as e:
-            logger.exception("")
-            self.user_interface.show_error(f"Failed to initialize new project: {e}")
+            on_error(e)
 
     def populate_data_structures_on_new_project(self) -> None:
         """
@@ -408,22 +505,31 @@ class Controller:
         Populates the data structures for the loaded project and updates the UI with the results.
         """
 
+        def on_imported() -> None:
+            self.populate_data_structures_on_load_project()
+            self.user_interface.set_categorization_type_label()
+            self.refresh_treeviews()
+            logger.info("Project loaded successfully")
+            self.user_interface.show_info("Project loaded successfully")
+
         logger.info("Starting load project")
+        on_error = partial(self.show_exception, "Failed to load project")
         try:
-            if self.file_import_logic(
-                file_types=[("JSON files", "*.json"), ("All files", "*.*")],
+            self.file_import_logic(
+                file_types=[
+                    ("Project files", "*.json *.json.zst"),
+                    ("JSON files", "*.json"),
+                    ("Compressed JSON files", "*.json.zst"),
+                    ("All files", "*.*"),
+                ],
                 title="Load Project",
                 data_model_method=self.data_model.file_import_on_load_project,
-            ):
-                self.populate_data_structures_on_load_project()
-                self.user_interface.set_categorization_type_label()
-                self.refresh_treeviews()
-                logger.info("Project loaded successfully")
-                self.user_interface.show_info("Project loaded successfully")
+                on_imported=on_imported,
+                on_error=on_error,
+            )
 
         except Exception as e:
-            logger.exception("")
-            self.user_interface.show_error(f"Failed to load project: {e}")
+            on_error(e)
 
     def populate_data_structures_on_load_project(self) -> None:
         """
@@ -446,39 +552,57 @@ class Controller:
         Populates the data structures for the appended data and updates the UI with the results.
         """
 
+        def on_imported() -> None:
+            self.data_model.populate_data_structures_on_append_data(
+                self.user_interface.categorization_type.get()
+            )
+            self.refresh_treeviews()
+            logger.info("Data appended successfully")
+            self.user_interface.show_info("Data appended successfully")
+
         logger.info("Starting append data")
+        on_error = partial(self.show_exception, "Failed to append data")
         try:
-            if self.file_import_logic(
+            self.file_import_logic(
                 file_types=[("CSV files", "*.csv"), ("XLSX files", "*.xlsx"), ("All files", "*.*")],
                 title="Select file containing data to append",
                 data_model_method=self.data_model.file_import_on_append_data,
-            ):
-                self.data_model.populate_data_structures_on_append_data(
-                    self.user_interface.categorization_type.get()
-                )
-                self.refresh_treeviews()
-                logger.info("Data appended successfully")
-                self.user_interface.show_info("Data appended successfully")
+                on_imported=on_imported,
+                on_error=on_error,
+            )
         except Exception as e:
-            logger.exception("")
-            self.user_interface.show_error(f"Failed to append data: {e}")
+            on_error(e)
 
     def file_import_logic(
-        self, file_types: list[Tuple[str, str]], title: str, data_model_method: Callable
-    ) -> bool:
+        self,
+        file_types: list[Tuple[str, str]],
+        title: str,
+        data_model_method: Callable,
+        on_imported: Callable[[], None],
+        on_error: Callable[[Exception], None],
+    ) -> None:
         """
         Handles the logic for importing files for new, load, or append data operations.
-        Prompts the user to select a file and calls the specified method in the data model to update itself.
+        Prompts the user to select a file and calls the specified method in the data model to update itself,
+        on the background worker thread.
 
         Args:
             file_types (list[Tuple[str, str]]): A list of file types to be accepted in the file dialog.
             title (str): The title of the file dialog window.
             data_model_method (Callable): The method to be called in the data model to update itself after file selection.
-
-        Returns:
-            bool: True if the file import operation was successful, False otherwise.
+            on_imported (Callable[[], None]): Called on the UI thread if the file import operation was successful.
+            on_error (Callable[[Exception], None]): Called with any exception raised while importing the file or by `on_imported`.
         """
 
+        def on_done(result: Tuple[bool, str]) -> None:
+            success, message = result
+            if not success:
+                logger.error(message)
+                self.user_interface.show_error(message)
+                return
+
+            on_imported()
+
         logger.info("Calling UI to get file path")
         file_path = self.user_interface.show_open_file_dialog(
             filetypes=file_types,
@@ -487,17 +611,10 @@ class Controller:
 
         if not file_path:
             logger.info("No file path selected")
-            return False
+            return
 
         logger.info("Calling data model to import file")
-        success, message = data_model_method(file_path)
-
-        if not success:
-            logger.error(message)
-            self.user_interface.show_error(message)
-            return False
-
-        return True
+        self.run_in_background(data_model_method, file_path, on_done=on_done, on_error=on_error)
 
     def save_project(self) -> None:
         """
@@ -505,13 +622,22 @@ class Controller:
         Calls the data model to save the project data.
         """
 
+        def on_saved(result: None) -> None:
+            logger.info("Project saved successfully")
+            self.user_interface.show_info("Project saved successfully to:\n\n" + file_path)
+
         # TODO: Possibly abstract out this method and export_data_to_csv method to inherit from single method?
         logger.info("Starting save project")
+        on_error = partial(self.show_exception, "Failed to save project")
         try:
             logger.info("Calling UI to get file path")
             if file_path := self.user_interface.show_save_file_dialog(
                 defaultextension=".json",
-                filetypes=[("JSON files", "*.json"), ("All files", "*.*")],
+                filetypes=[
+                    ("JSON files", "*.json"),
+                    ("Compressed JSON files", "*.json.zst"),
+                    ("All files", "*.*"),
+                ],
                 title="Save Project As",
             ):
                 user_interface_variables_to_add = {
@@ -520,16 +646,19 @@ class Controller:
                 }
 
                 logger.info("Calling data model to save project")
-                self.data_model.save_project(file_path, user_interface_variables_to_add)
-                logger.info("Project saved successfully")
-                self.user_interface.show_info("Project saved successfully to:\n\n" + file_path)
+                self.run_in_background(
+                    self.data_model.save_project,
+                    file_path,
+                    user_interface_variables_to_add,
+                    on_done=on_saved,
+                    on_error=on_error,
+                )
 
             else:
                 logger.info("No file path selected")
 
         except Exception as e:
-            logger.exception("")
-            self.user_interface.show_error(f"Failed to save project: {e}")
+            on_error(e)
 
     def export_data_to_csv(self) -> None:
         """
@@ -537,26 +666,39 @@ class Controller:
         Calls the data model to export the data.
         """
 
+        def on_exported(result: None) -> None:
+            logger.info("Data exported successfully")
+            self.user_interface.show_info("Data exported successfully to:\n\n" + file_path)
+
         logger.info("Starting data export")
+        on_error = partial(self.show_exception, "Failed to export data to csv")
         try:
             logger.info("Calling UI to get file path")
             if file_path := self.user_interface.show_save_file_dialog(
                 defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+                filetypes=[
+                    ("CSV files", "*.csv"),
+                    ("Parquet files", "*.parquet"),
+                    ("Feather files", "*.feather"),
+                    ("All files", "*.*"),
+                ],
                 title="Save As",
             ):
                 categorization_type = self.user_interface.categorization_type.get()
                 logger.info("Calling data model to export data")
-                self.data_model.export_data_to_csv(file_path, categorization_type)
-                logger.info("Data exported successfully")
-                self.user_interface.show_info("Data exported successfully to:\n\n" + file_path)
+                self.run_in_background(
+                    self.data_model.export_data_to_csv,
+                    file_path,
+                    categorization_type,
+                    on_done=on_exported,
+                    on_error=on_error,
+                )
 
             else:
                 logger.info("No file path selected")
 
         except Exception as e:
-            logger.exception("")
-            self.user_interface.show_error(f"Failed to export data to csv: {e}")
+            on_error(e)
 
     ### ----------------------- UI management ----------------------- ###
     def refresh_treeviews(self) -> None:
@@ -592,13 +734,13 @@ class Controller:
 
         if len(selected_categories) == 0:
             logger.error("No category selected to display results of")
-            logger.debug(f"selected categories: {selected_categories}")
+            logger.debug("selected categories: %s", selected_categories)
             self.user_interface.show_error("No category selected")
             return
 
         if len(selected_categories) > 1:
             logger.error("Only one category can be displayed")
-            logger.debug(f"selected categories: {selected_categories}")
+            logger.debug("selected categories: %s", selected_categories)
             self.user_interface.show_warning("Please select only one category")
             return
 
@@ -15,10 +15,11 @@ Key functionalities:
     - Calculating and formatting data for display.
 
 Main dependencies:
-    - `thefuzz`: for performing fuzzy matching.
+    - `rapidfuzz`: for performing fuzzy matching.
     - `pandas`: for data manipulation.
+    - `numpy`: for working with the raw arrays behind the pandas data structures.
     - `re`: for pattern matching during data cleaning.
-    - `io`: for converting data to json serializable format.
+    - `collections`: for keeping count of responses.
     - `file_handler`: a module from this project for performing file saving and loading functions.
 
 Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
@@ -27,15 +28,26 @@ Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
 import logging
 import logging_utils
 import re
-from thefuzz import fuzz
+from collections import Counter
+from rapidfuzz import fuzz, process
+import numpy as np
 import pandas as pd
-from io import StringIO
 from typing import Any, Tuple
 from pandas._libs.missing import NAType
 from file_handler import FileHandler
 
 logger = logging.getLogger(__name__)
 
+# Patterns used when cleaning response text
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+_SPECIAL_CHARACTERS_PATTERN = re.compile(r"[^a-z0-9\s]")
+
+# Category columns only ever hold 1, 0 or missing data, so a nullable 1 byte integer is enough
+_CATEGORY_COLUMN_DTYPE = pd.UInt8Dtype()
+
+# Sentinel for values missing from loaded project data, since None is a valid loaded value
+_MISSING = object()
+
 
 class DataModel:
     """
@@ -48,16 +60,17 @@ class DataModel:
         - `data_loaded` (dict[str, Any]): Loaded project data (all the relevant class attributes) from json file.
         - `response_columns` (list[str]): List of response column names.
         - `preprocessed_responses` (pd.DataFrame): DataFrame of cleaned response columns from raw_data.
-        - `stacked_responses` (pd.Series): Series containing the stacked, deduplicated responses, excluding missing data.
-        - `response_counts` (dict[str, int]): Dictionary holding counts of responses, including missing data.
+        - `response_counts` (Counter[str]): Counter holding counts of responses, including missing data.
         - `categorized_data` (pd.DataFrame): DataFrame containing categorized responses. This is the main DataFrame of the application.
             First column contains uuids, the next columns are the response columns, and then the subsequent columns are for each category, repeated out for each response column (with the name appended on the end).
             The values of the category columns are 1, 0, or pd.NA, depending on whether or not the responses in their associated response column are categorized into that category, or missing data.
         - `categorized_dict` (dict[str, str]): Dictionary of categories to deduplicated responses, excluding missing data.
+        - `category_counts` (dict[str, int]): Dictionary of categories to the total count of their responses in the dataset.
+            Kept up to date alongside `categorized_dict`, so metrics don't need to recount every response.
         - `fuzzy_match_results` (pd.DataFrame): DataFrame holding results and score of fuzzy matching.
         - `currently_displayed_category` (str): The category currently being displayed in the UI.
         - `expected_json_structure` (dict[str, type]): A dictionary of types for each class attribute, for validation loaded project data.
-        - `export_df` (pd.DataFrame): The finalized data to export to CSV.
+        - `export_df` (pd.DataFrame): The finalized data to export.
 
     Methods:
         - `initialize_data_structures`: Initializes empty data structures used in the model.
@@ -77,15 +90,22 @@ class DataModel:
         - `file_import_on_append_data`: Handles importing data to append to the current project.
         - `populate_data_structures_on_append_data`: Populates data structures when appending data.
         - `save_project`: Saves all the current project's relevant data (the class attributes) to a JSON file.
-        - `export_data_to_csv`: Exports the categorized data to a CSV file.
+        - `export_data_to_csv`: Exports the categorized data to a CSV, Parquet or Feather file.
         - `preprocess_text`: Cleans text data (e.g. response text).
-        - `process_fuzzy_match_results`: Filters, aggregates and sorts the fuzzy match results for display.
+        - `preprocess_responses`: Cleans all the response columns of a DataFrame at once.
+        - `count_responses`: Counts each distinct response across all the response columns of a DataFrame.
+        - `process_fuzzy_match_results`: Filters, counts and sorts the fuzzy match results for display.
+        - `cast_column_dtypes`: Casts the response and category columns of `categorized_data` to compact dtypes.
+        - `get_response_masks`: Finds where a set of responses appear in every response column at once.
         - `handle_missing_data`: Handles missing data in categorized_data and `categorized_dict`.
         - `validate_loaded_json`: Validates the structure of loaded JSON project data.
         - `get_responses_and_counts`: Retrieves responses and their counts for a specific category.
         - `format_categories_metrics`: Formats metrics for categories to be displayed.
+        - `add_to_categorized_dict`: Adds responses to a category in `categorized_dict`, keeping `category_counts` up to date.
+        - `remove_from_categorized_dict`: Removes responses from a category in `categorized_dict`, keeping `category_counts` up to date.
+        - `recount_categories`: Recalculates `category_counts` from scratch.
         - `sum_response_counts`: Sums the response counts for a set of responses.
-        - `calculate_percentage`: Calculates the percentage of responses for a category, with or without missing data.
+        - `calculate_percentage`: Calculates the percentage of responses for a category out of a total.
     """
 
     def __init__(self, file_handler: FileHandler) -> None:
@@ -111,8 +131,9 @@ class DataModel:
         self.preprocessed_responses = pd.DataFrame()
         self.response_columns = []
         self.categorized_data = pd.DataFrame()
-        self.response_counts = {}
+        self.response_counts = Counter()
         self.categorized_dict = {"Uncategorized": set()}
+        self.category_counts = {"Uncategorized": 0}
         self.fuzzy_match_results = pd.DataFrame(columns=["response", "score"])  # default
         self.currently_displayed_category = "Uncategorized"  # default
 
@@ -138,6 +159,8 @@ class DataModel:
         Handles the logic for performing fuzzy matching on the data against a provided string.
         Results are stored in `fuzzy_match_results`.
 
+        Every response is kept, whatever its score, so the threshold slider only ever filters the one set of results.
+
         Uses `fuzzy_match` method to perform the actual match.
 
         Args:
@@ -151,27 +174,29 @@ class DataModel:
         if self.categorized_data.empty or self.categorized_data is None:
             message = "There is no dataset in the current project to match against"
             logger.warning(message)
-            logger.debug(f"categorized_data:\n{self.categorized_data}")
+            logger.debug("categorized_data:\n%s", self.categorized_data)
             return False, message
 
         logger.info(f'Preparing to perform fuzzy match: "{string_to_match}"')
+        # categorized_dict already holds the deduplicated responses, so each one only gets scored once
         uncategorized_responses = self.categorized_dict["Uncategorized"]
-        uncategorized_df = self.preprocessed_responses[
-            self.preprocessed_responses.isin(uncategorized_responses)
-        ].dropna(how="all")
 
         # Perform fuzzy matching on these uncategorized responses
-        self.fuzzy_match_results = self.fuzzy_match(uncategorized_df, string_to_match)
+        self.fuzzy_match_results = self.fuzzy_match(uncategorized_responses, string_to_match)
 
         return True, "Performed fuzzy match successfully"
 
-    def fuzzy_match(self, preprocessed_responses: pd.DataFrame, match_string: str) -> pd.DataFrame:
+    def fuzzy_match(
+        self, responses: set[str], match_string: str, score_cutoff: float = 0
+    ) -> pd.DataFrame:
         """
         Performs the actual fuzzy match against a provided match string, and returns the results.
 
         Args:
-            preprocessed_responses (pd.DataFrame): The preprocessed responses to be matched against.
+            responses (set[str]): The deduplicated preprocessed responses to be matched against, excluding missing data.
             match_string (str): The string to be matched fuzzily against the responses.
+            score_cutoff (float, optional): Responses scoring below this are left out of the results.
+                Passed to rapidfuzz so it can skip the full scoring of responses that can't reach it. Defaults to 0.
 
         Returns:
             pd.DataFrame: A DataFrame containing the fuzzy match responses and scores.
@@ -179,21 +204,35 @@ class DataModel:
 
         logger.info(f'Performing fuzzy match: "{match_string}"')
 
-        def _fuzzy_match(element) -> int:
-            return fuzz.WRatio(
-                match_string, str(element)
-            )  # Weighted ratio of several fuzzy matching protocols
-
-        # Get fuzzy matching scores and format result: {response: score}
-        # Use preprocessed_responses since it only contains the data we need (response columns are identical to categorized_data)
-        results = []
-        for row in preprocessed_responses.itertuples(index=True, name=None):
-            for response in row[1:]:
-                score = _fuzzy_match(response)
-                results.append({"response": response, "score": score})
+        responses = np.fromiter(responses, dtype=object, count=len(responses))
+
+        # Responses are already preprocessed, so clean the match string the same way once
+        # and skip rapidfuzz's own per-string processing
+        processed_match_string = self.preprocess_text(match_string)
+
+        # Score all responses in one call, parallelised across all cores.
+        # Weighted ratio of several fuzzy matching protocols.
+        # With a cutoff, rapidfuzz bails out early (e.g. on length ratio) for responses that can't reach it, and scores them 0.
+        # The cutoff applies before rounding, so leave a margin for scores that round up to it.
+        scores = process.cdist(
+            [processed_match_string],
+            responses,
+            scorer=fuzz.WRatio,
+            processor=None,
+            dtype=np.float64,
+            workers=-1,
+            score_cutoff=max(score_cutoff - 0.5, 0),
+        )[0]
+        # Rounded to int as in thefuzz. cdist's int dtypes round halves up, but thefuzz uses round(), which rounds
+        # halves to even, as np.round does
+        scores = np.round(scores).astype(np.int32)
+
+        if score_cutoff > 0:
+            is_above_cutoff = scores >= score_cutoff
+            responses, scores = responses[is_above_cutoff], scores[is_above_cutoff]
 
         logger.info("Performed fuzzy match successfully")
-        return pd.DataFrame(results)
+        return pd.DataFrame({"response": responses, "score": scores})
 
     def categorize_responses(
         self, responses: set[str], categories: set[str], categorization_type: str
@@ -211,12 +250,17 @@ class DataModel:
         """
 
         logger.info("Categorizing responses")
-        for response_column in self.response_columns:
+        response_masks = self.get_response_masks(responses)
+        for i, response_column in enumerate(self.response_columns):
             if categorization_type == "Single":
-                self.remove_responses_from_category(responses, "Uncategorized", response_column)
+                self.remove_responses_from_category(
+                    responses, "Uncategorized", response_column, response_masks[:, i]
+                )
 
             for category in categories:
-                self.add_responses_to_category(responses, category, response_column)
+                self.add_responses_to_category(
+                    responses, category, response_column, response_masks[:, i]
+                )
 
         if categorization_type == "Single":
             # Additionally, remove the responses from fuzzy_match_results
@@ -237,17 +281,20 @@ class DataModel:
         """
 
         logger.info("Recategorizing responses")
-        for response_column in self.response_columns:
+        response_masks = self.get_response_masks(responses)
+        for i, response_column in enumerate(self.response_columns):
             self.remove_responses_from_category(
-                responses, self.currently_displayed_category, response_column
+                responses, self.currently_displayed_category, response_column, response_masks[:, i]
             )
 
             for category in categories:
-                self.add_responses_to_category(responses, category, response_column)
+                self.add_responses_to_category(
+                    responses, category, response_column, response_masks[:, i]
+                )
         logger.info("Responses recategorized")
 
     def add_responses_to_category(
-        self, responses: set[str], category: str, response_column: str
+        self, responses: set[str], category: str, response_column: str, mask: np.ndarray
     ) -> None:
         """
         Handles adding responses to a category in the data. Used by `categorize_responses` and `recategorize_responses` methods.
@@ -260,14 +307,14 @@ class DataModel:
             responses (set[str]): A set of responses to be added to the category.
             category (str): The category to which the responses will be added.
             response_column (str): The name of the response column we are working with.
+            mask (np.ndarray): Boolean array that is True for each row of the response column that matches the responses.
         """
 
-        mask = self.categorized_data[response_column].isin(responses)
         self.categorized_data.loc[mask, f"{category}_{response_column}"] = 1
-        self.categorized_dict[category].update(responses)
+        self.add_to_categorized_dict(responses, category)
 
     def remove_responses_from_category(
-        self, responses: set[str], category: str, response_column: str
+        self, responses: set[str], category: str, response_column: str, mask: np.ndarray
     ) -> None:
         """
         Handles removing responses from a category in the data. Used by `categorize_responses` and `recategorize_responses` methods.
@@ -280,11 +327,11 @@ class DataModel:
             responses (set[str]): A set of responses to be removed from the category.
             category (str): The category from which the responses will be removed.
             response_column (str): The response column where the responses are located.
+            mask (np.ndarray): Boolean array that is True for each row of the response column that matches the responses.
         """
 
-        mask = self.categorized_data[response_column].isin(responses)
         self.categorized_data.loc[mask, f"{category}_{response_column}"] = 0
-        self.categorized_dict[category] -= responses
+        self.remove_from_categorized_dict(responses, category)
 
     def create_category(self, new_category: str) -> Tuple[bool, str]:
         """
@@ -307,10 +354,11 @@ class DataModel:
         if new_category in self.categorized_dict.keys():
             message = "Category already exists"
             logger.warning(message)
-            logger.debug(f"categorized_dict.keys:\n{self.categorized_dict.keys()}")
+            logger.debug("categorized_dict.keys:\n%s", self.categorized_dict.keys())
             return False, message
 
         self.categorized_dict[new_category] = set()
+        self.category_counts[new_category] = 0
         number_of_categories = len(self.categorized_dict.keys())
 
         # Start insert after uuid column + response columns
@@ -325,7 +373,11 @@ class DataModel:
             # New categories come after previous ones, but before uncategorized
             insert_index = insert_index_start + i * number_of_categories + offset
             # Give all rows a value of 0 to start
-            self.categorized_data.insert(insert_index, col_name, 0)
+            self.categorized_data.insert(
+                insert_index,
+                col_name,
+                pd.Series(0, index=self.categorized_data.index, dtype=_CATEGORY_COLUMN_DTYPE),
+            )
 
         self.handle_missing_data()
 
@@ -354,7 +406,7 @@ class DataModel:
         if new_category in self.categorized_dict.keys():
             message = "A category with this name already exists."
             logger.warning(message)
-            logger.debug(f"categorized_dict.keys:\n{self.categorized_dict.keys()}")
+            logger.debug("categorized_dict.keys:\n%s", self.categorized_dict.keys())
             return False, message
 
         for response_column in self.response_columns:
@@ -363,6 +415,7 @@ class DataModel:
                 inplace=True,
             )
         self.categorized_dict[new_category] = self.categorized_dict.pop(old_category)
+        self.category_counts[new_category] = self.category_counts.pop(old_category)
 
         message = "Category renamed successfully"
         logger.info(message)
@@ -381,20 +434,38 @@ class DataModel:
 
         logger.info("Deleting categories: %s", categories_to_delete)
 
-        for category in categories_to_delete:
+        # In single mode, return the responses from these categories to 'Uncategorized'
+        if categorization_type == "Single":
             for response_column in self.response_columns:
-                # In single mode, return the responses from this category to 'Uncategorized'
-                if categorization_type == "Single":
-                    responses_to_recategorize = self.categorized_data[
-                        self.categorized_data[f"{category}_{response_column}"] == 1
-                    ].index
-                    for response in responses_to_recategorize:
-                        self.categorized_data.loc[response, f"Uncategorized_{response_column}"] = 1
-                    self.categorized_dict["Uncategorized"].update(self.categorized_dict[category])
-
-                # Remove categories
-                self.categorized_data.drop(columns=f"{category}_{response_column}", inplace=True)
+                category_columns = [
+                    f"{category}_{response_column}" for category in categories_to_delete
+                ]
+                # One mask across all the deleted categories, so there is a single store per response column
+                responses_to_recategorize_mask = (
+                    self.categorized_data[category_columns]
+                    .eq(1)
+                    .any(axis=1)
+                    .to_numpy(dtype=bool, na_value=False)
+                )
+                self.categorized_data.loc[
+                    responses_to_recategorize_mask, f"Uncategorized_{response_column}"
+                ] = 1
+
+            for category in categories_to_delete:
+                self.add_to_categorized_dict(self.categorized_dict[category], "Uncategorized")
+
+        # Remove categories
+        self.categorized_data.drop(
+            columns=[
+                f"{category}_{response_column}"
+                for category in categories_to_delete
+                for response_column in self.response_columns
+            ],
+            inplace=True,
+        )
+        for category in categories_to_delete:
             del self.categorized_dict[category]
+            del self.category_counts[category]
 
         logger.info("Categories deleted successfully")
 
@@ -419,12 +490,12 @@ class DataModel:
         if new_data.empty:
             message = "Imported dataset is empty"
             logger.error(message)
-            logger.debug(f"new_data:\n{new_data.head()}")
+            logger.debug("new_data:\n%s", new_data.head())
             return False, message
 
         if new_data.shape[1] < 2:
             logger.error("Imported dataset does not contain enough columns")
-            logger.debug(f"new_data:\n{new_data.head()}")
+            logger.debug("new_data:\n%s", new_data.head())
             return (
                 False,
                 """Imported dataset does not contain enough columns.\n\n
@@ -447,22 +518,22 @@ class DataModel:
         logger.info("Populating data structures")
 
         # Processed data slices and metrics
-        self.preprocessed_responses = pd.DataFrame(
-            self.raw_data.iloc[:, 1:].map(self.preprocess_text)
-        )
+        self.preprocessed_responses = self.preprocess_responses(self.raw_data.iloc[:, 1:])
         uuids = self.raw_data.iloc[:, 0]
         self.response_columns = list(self.preprocessed_responses.columns)
-        self.stacked_responses = self.preprocessed_responses.stack(dropna=False).reset_index(
-            drop=True
-        )
-        self.response_counts = self.stacked_responses.value_counts(dropna=False).to_dict()
+        self.response_counts = self.count_responses(self.preprocessed_responses)
 
         # Main categorized data structures
-        self.categorized_dict = {"Uncategorized": set(self.stacked_responses.dropna())}
+        # The counted responses are already deduplicated. Missing data is always counted under pd.NA.
+        self.categorized_dict = {"Uncategorized": self.response_counts.keys() - {pd.NA}}
+        self.recount_categories()
         self.categorized_data = pd.concat([uuids, self.preprocessed_responses], axis=1)
         for response_column in self.response_columns:
             # Everything starts uncategorized
-            self.categorized_data[f"Uncategorized_{response_column}"] = 1
+            self.categorized_data[f"Uncategorized_{response_column}"] = pd.Series(
+                1, index=self.categorized_data.index, dtype=_CATEGORY_COLUMN_DTYPE
+            )
+        self.cast_column_dtypes()
         self.handle_missing_data()
 
         # Other app data
@@ -512,26 +583,23 @@ class DataModel:
 
         logger.info("Populating data structures")
 
-        # pd.NA is not JSON serializable so gets saved as None, need to load it back properly
-        def _replace_none_with_pd_na(df):
-            return df.map(lambda x: pd.NA if x is None else x)
-
         # Processed data slices and metrics
-        self.raw_data = _replace_none_with_pd_na(
-            pd.read_json(StringIO(self.data_loaded["raw_data"]))
+        self.raw_data = self.file_handler.deserialize_dataframe(self.data_loaded["raw_data"])
+        self.preprocessed_responses = self.file_handler.deserialize_dataframe(
+            self.data_loaded["preprocessed_responses"]
         )
-        self.preprocessed_responses = _replace_none_with_pd_na(
-            pd.read_json(StringIO(self.data_loaded["preprocessed_responses"]))
+        self.response_columns = self.data_loaded["response_columns"]
+        self.response_counts = Counter(
+            {k if k != "null" else pd.NA: v for k, v in self.data_loaded["response_counts"].items()}
         )
-        self.response_counts = {
-            k if k != "null" else pd.NA: v for k, v in self.data_loaded["response_counts"].items()
-        }
 
         # Main categorized data structures
-        self.categorized_data = _replace_none_with_pd_na(
-            pd.read_json(StringIO(self.data_loaded["categorized_data"]))
+        self.categorized_data = self.file_handler.deserialize_dataframe(
+            self.data_loaded["categorized_data"]
         )
         self.categorized_dict = {k: set(v) for k, v in self.data_loaded["categorized_dict"].items()}
+        self.recount_categories()
+        self.cast_column_dtypes()
 
         # Other app data
         self.currently_displayed_category = "Uncategorized"  # Default
@@ -574,7 +642,7 @@ class DataModel:
         if new_data.empty:
             message = "Imported dataset is empty"
             logger.error(message)
-            logger.debug(f"new_data:\n{new_data}")
+            logger.debug("new_data:\n%s", new_data)
             return False, message
 
         # using self.raw_data as it should have the same columns as self.categorized_data without the category columns.
@@ -583,8 +651,10 @@ class DataModel:
                 "Imported dataset does not have the same number of columns as the dataset in the current project"
             )
             logger.debug(
-                f"""new_data:\n{new_data.head()}\n
-                raw_data:\n{self.raw_data.head()}"""
+                """new_data:\n%s\n
+                raw_data:\n%s""",
+                new_data.head(),
+                self.raw_data.head(),
             )
             return (
                 False,
@@ -612,19 +682,15 @@ class DataModel:
         ### Append data
         self.raw_data = pd.concat([self.raw_data, self.data_to_append], ignore_index=True)
         old_data_size = len(self.preprocessed_responses)
-        new_preprocessed_responses = pd.DataFrame(
-            self.raw_data.iloc[old_data_size:, 1:].map(self.preprocess_text)
+        new_preprocessed_responses = self.preprocess_responses(
+            self.raw_data.iloc[old_data_size:, 1:]
         )
         self.preprocessed_responses = pd.concat(
             [self.preprocessed_responses, new_preprocessed_responses]
         )
-        new_stacked_responses = new_preprocessed_responses.stack(dropna=False).reset_index(
-            drop=True
-        )
-        self.stacked_responses = self.preprocessed_responses.stack(dropna=False).reset_index(
-            drop=True
-        )
-        self.response_counts = self.stacked_responses.value_counts(dropna=False).to_dict()
+        # Only the new responses need counting
+        new_response_counts = self.count_responses(new_preprocessed_responses)
+        self.response_counts.update(new_response_counts)
 
         ### Categorize new responses
         # TODO: This section is probably more bulky and inefficient than it needs to be
@@ -636,13 +702,13 @@ class DataModel:
                 if category != "Uncategorized"
             ]
         )
-        new_responses_set = set(new_stacked_responses.dropna())
+        new_responses_set = new_response_counts.keys() - {pd.NA}
         new_uncategorized_responses_set = new_responses_set - old_categorized_responses_set
         new_already_categorized_responses_set = new_responses_set.intersection(
             old_categorized_responses_set
         )
 
-        self.categorized_dict["Uncategorized"].update(new_uncategorized_responses_set)
+        self.add_to_categorized_dict(new_uncategorized_responses_set, "Uncategorized")
         new_categorized_data = pd.concat(
             [self.raw_data.iloc[old_data_size:, 0], new_preprocessed_responses], axis=1
         )  # ? Why isn't this axis=0?
@@ -653,6 +719,8 @@ class DataModel:
             for category in self.categorized_dict.keys():
                 self.categorized_data.loc[old_data_size:, f"Uncategorized_{response_column}"] = 1
                 self.categorized_data.loc[old_data_size:, f"{category}_{response_column}"] = 0
+        # The concat mixes categories and leaves the category columns of the new rows empty, which loses their dtypes
+        self.cast_column_dtypes()
 
         # Categorize the new responses that are already in the codeframe
         for new_response in new_already_categorized_responses_set:
@@ -665,6 +733,8 @@ class DataModel:
                 {str(new_response)}, categories_for_new_response, categorization_type
             )
 
+        # The counts of responses that were already in the codeframe have grown too
+        self.recount_categories()
         self.handle_missing_data()
 
         ### Other app data
@@ -689,33 +759,36 @@ class DataModel:
         logger.info("Preparing to save project data")
 
         data_to_save = {
-            "raw_data": self.raw_data.to_json(),
-            "preprocessed_responses": self.preprocessed_responses.to_json(),
+            "raw_data": self.file_handler.serialize_dataframe(self.raw_data),
+            "preprocessed_responses": self.file_handler.serialize_dataframe(
+                self.preprocessed_responses
+            ),
             "response_columns": self.response_columns,
-            "categorized_data": self.categorized_data.to_json(),
+            "categorized_data": self.file_handler.serialize_dataframe(self.categorized_data),
             "response_counts": {
                 k if k is not pd.NA else None: v for k, v in self.response_counts.items()
             },
-            "categorized_dict": {k: list(v) for k, v in self.categorized_dict.items()},
+            # Pandas NAType is not JSON serializable. Replacing it here means the JSON encoder never has to call back
+            # into Python for it.
+            "categorized_dict": {
+                k: [response if response is not pd.NA else None for response in v]
+                for k, v in self.categorized_dict.items()
+            },
         }
         data_to_save.update(user_interface_variables_to_add)
 
-        # Pandas NAType is not JSON serializable
-        def _none_handler(o):
-            if pd.isna(o):
-                return None
-
         logger.info("Calling file handler to save project data")
-        self.file_handler.save_data_to_json(file_path, data_to_save, handler=_none_handler)
+        self.file_handler.save_data_to_json(file_path, data_to_save)
 
     def export_data_to_csv(self, file_path: str, categorization_type: str) -> None:
         """
-        Exports categorized data to a CSV file. Removes the response columns before export.
+        Exports categorized data to a file, CSV unless the file path ends in .parquet or .feather.
+        Removes the response columns before export.
 
         If `categorization_type == "Multi"`, the redundant "Uncategorized" columns are also removed.
 
         Args:
-            file_path (str): The path where the exported CSV file will be saved.
+            file_path (str): The path where the exported file will be saved.
             categorization_type (str): The categorization type ('Single' or 'Multi'), effecting how the data is prepared before exporting.
         """
 
@@ -729,8 +802,8 @@ class DataModel:
             for response_column in self.response_columns:
                 self.export_df.drop(f"Uncategorized_{response_column}", axis=1, inplace=True)
 
-        logger.info("Calling file handler  export categorized data to csv")
-        self.file_handler.export_dataframe_to_csv(file_path, self.export_df)
+        logger.info("Calling file handler to export categorized data")
+        self.file_handler.export_dataframe(file_path, self.export_df)
 
     ### ----------------------- Helper functions ----------------------- ###
     def preprocess_text(self, text: Any) -> str | NAType:
@@ -750,15 +823,59 @@ class DataModel:
 
         text = str(text).lower()
         # Convert one or more of any kind of space to single space
-        text = re.sub(r"\s+", " ", text)
+        text = _WHITESPACE_PATTERN.sub(" ", text)
         # Remove special characters
-        text = re.sub(r"[^a-z0-9\s]", "", text)
+        text = _SPECIAL_CHARACTERS_PATTERN.sub("", text)
         text = text.strip()
         return text
 
+    def preprocess_responses(self, responses: pd.DataFrame) -> pd.DataFrame:
+        """
+        Cleans every response column in the same way as `preprocess_text`, using vectorized string operations per column
+        rather than calling `preprocess_text` for each cell.
+        Preserves missing data.
+
+        Args:
+            responses (pd.DataFrame): The response columns to be preprocessed.
+
+        Returns:
+            pd.DataFrame: The preprocessed responses, with pd.NA wherever the input is missing data.
+        """
+
+        def _preprocess_column(column: pd.Series) -> pd.Series:
+            processed_column = (
+                column.astype(str)
+                .str.lower()
+                .str.replace(_WHITESPACE_PATTERN, " ", regex=True)
+                .str.replace(_SPECIAL_CHARACTERS_PATTERN, "", regex=True)
+                .str.strip()
+            )
+            return processed_column.where(column.notna(), pd.NA)
+
+        return responses.apply(_preprocess_column)
+
+    def count_responses(self, responses: pd.DataFrame) -> Counter:
+        """
+        Counts each distinct response across all the response columns of a DataFrame, including missing data.
+
+        Args:
+            responses (pd.DataFrame): The preprocessed response columns to count.
+
+        Returns:
+            Counter: Counts of each response, with missing data counted under pd.NA.
+        """
+
+        # Hash-based counting over the raw flattened array, rather than stacking into a MultiIndexed Series first.
+        # (np.unique would sort the object array with Python comparisons, and can't count pd.NA.)
+        return Counter(
+            pd.Series(responses.to_numpy().ravel(), dtype=object)
+            .value_counts(dropna=False)
+            .to_dict()
+        )
+
     def process_fuzzy_match_results(self, threshold_value: float) -> pd.DataFrame:
         """
-        Filters the fuzzy match results based on the provided threshold value, and aggregates the results by score and count.
+        Filters the fuzzy match results based on the provided threshold value, and adds the count of each response in the dataset.
 
         Args:
             threshold_value (float): The threshold value for filtering the fuzzy match results by score.
@@ -772,16 +889,60 @@ class DataModel:
             self.fuzzy_match_results["score"] >= threshold_value
         ]
 
-        aggregated_results = (
-            filtered_results.groupby("response")
-            .agg(
-                score=pd.NamedAgg(column="score", aggfunc="max"),
-                count=pd.NamedAgg(column="response", aggfunc="count"),
-            )
-            .reset_index()
+        # The results are already deduplicated, so the counts can be looked up rather than aggregated
+        aggregated_results = filtered_results.assign(
+            count=filtered_results["response"].map(self.response_counts)
+        )
+
+        # Sort alphabetically last to keep the order of ties stable
+        return aggregated_results.sort_values(
+            by=["score", "count", "response"], ascending=[False, False, True]
         )
 
-        return aggregated_results.sort_values(by=["score", "count"], ascending=[False, False])
+    def cast_column_dtypes(self) -> None:
+        """
+        Casts the columns in `categorized_data` to compact dtypes.
+
+        The response columns share a single categorical dtype, so responses can be looked up by their integer codes.
+        The category columns are cast to a nullable 1 byte integer dtype.
+
+        Used after `categorized_data` is rebuilt from data that doesn't keep the dtypes (e.g. loaded JSON, concatenation).
+        """
+
+        response_values = pd.unique(self.categorized_data[self.response_columns].to_numpy().ravel())
+        response_dtype = pd.CategoricalDtype(categories=pd.Index(response_values).dropna())
+        self.categorized_data[self.response_columns] = self.categorized_data[
+            self.response_columns
+        ].astype(response_dtype)
+
+        # Category columns come after the uuid column and response columns
+        category_columns = self.categorized_data.columns[1 + len(self.response_columns) :]
+        self.categorized_data[category_columns] = self.categorized_data[category_columns].astype(
+            _CATEGORY_COLUMN_DTYPE
+        )
+
+    def get_response_masks(self, responses: set[str]) -> np.ndarray:
+        """
+        Finds where the provided responses appear in every response column of `categorized_data` at once.
+
+        Args:
+            responses (set[str]): A set of responses to look for.
+
+        Returns:
+            np.ndarray: 2D boolean array that is True where a row of a response column matches one of the responses.
+                Its columns follow the order of `response_columns`.
+        """
+
+        # The response columns share a categorical dtype, so the responses only need to be looked up once,
+        # and the columns can then be compared by their integer codes. Missing data has code -1 so never matches.
+        response_categories = self.categorized_data[self.response_columns[0]].cat.categories
+        response_codes = response_categories.get_indexer(list(responses))
+        response_codes = response_codes[response_codes != -1]
+
+        column_codes = np.column_stack(
+            [self.categorized_data[column].cat.codes.to_numpy() for column in self.response_columns]
+        )
+        return np.isin(column_codes, response_codes)
 
     def handle_missing_data(self) -> None:
         """
@@ -790,23 +951,24 @@ class DataModel:
         Sets all the category columns to pd.NA for each response column, for the rows where those response columns are empty.
         """
 
-        def _is_missing(value) -> bool:
-            return pd.isna(value)
-
         logger.debug(
-            f"""Handling missing data\n
-            categorized_data (before):\n{self.categorized_data.head()}\n"""
+            """Handling missing data\n
+            categorized_data (before):\n%s\n""",
+            self.categorized_data.head(),
         )
 
-        for response_column in self.response_columns:
-            # Boolean mask where each row is True if the corresponding response column rows are empty
-            missing_data_mask = self.preprocessed_responses[response_column].map(_is_missing)
+        # Boolean array where each row is True if the corresponding response column rows are empty.
+        # Computed for all response columns at once, as a numpy array to skip index alignment when assigning.
+        missing_data_masks = self.preprocessed_responses[self.response_columns].isna().to_numpy()
 
+        for i, response_column in enumerate(self.response_columns):
             # Using categorized_dict as an easy way to get the category names
-            for category in self.categorized_dict:
-                col_name = f"{category}_{response_column}"
-                self.categorized_data.loc[missing_data_mask, col_name] = pd.NA
-            logger.debug(f"categorized_data (after):\n{self.categorized_data.head()}\n" "")
+            category_columns = [
+                f"{category}_{response_column}" for category in self.categorized_dict
+            ]
+            self.categorized_data.loc[missing_data_masks[:, i], category_columns] = pd.NA
+
+        logger.debug("categorized_data (after):\n%s\n", self.categorized_data.head())
 
     def validate_loaded_json(
         self, loaded_json_data: dict[str, Any], expected_data: dict[str, Any]
@@ -830,36 +992,48 @@ class DataModel:
         logger.debug("Validating project data")
 
         if not loaded_json_data:
-            logger.debug(f"loaded_json_data:\n{loaded_json_data}")
+            logger.debug("loaded_json_data:\n%s", loaded_json_data)
             return False, "Loaded project data is empty"
 
-        # Unexpected variabes
-        if unexpected_keys := set(loaded_json_data.keys()) - set(expected_data.keys()):
+        # Unexpected variabes (dict key views support set operations directly, without copying into sets)
+        if unexpected_keys := loaded_json_data.keys() - expected_data.keys():
             logger.debug(
-                f"""loaded_json_data.keys:\n{loaded_json_data.keys()}\n
-                expected_data.keys:\n{expected_data.keys()}"""
+                """loaded_json_data.keys:\n%s\n
+                expected_data.keys:\n%s""",
+                loaded_json_data.keys(),
+                expected_data.keys(),
             )
             return False, f"Unexpected variables loaded: {', '.join(unexpected_keys)}"
 
         for expected_key, expected_type in expected_data.items():
             # Missing variables
-            if expected_key not in loaded_json_data:
+            loaded_value = loaded_json_data.get(expected_key, _MISSING)
+            if loaded_value is _MISSING:
                 logger.debug(
-                    f"""expected_key:\n{expected_key}\n
-                    loaded_json_data.keys:\n{loaded_json_data.keys()}"""
+                    """expected_key:\n%s\n
+                    loaded_json_data.keys:\n%s""",
+                    expected_key,
+                    loaded_json_data.keys(),
                 )
                 return False, f"Variable '{expected_key}' is missing from loaded project data"
 
             # Wrong variable type
             # skip the bool case (e.g. `is_including_missing_data`) since its value would be evaluated in the if statement
-            if expected_type is not bool and not loaded_json_data[expected_key]:
-                logger.debug(f"{expected_key}:\n{loaded_json_data[expected_key]}")
+            if expected_type is not bool and not loaded_value:
+                logger.debug("%s:\n%s", expected_key, loaded_value)
                 return False, f"Variable '{expected_key}' is empty in loaded project data"
 
-            if not isinstance(loaded_json_data[expected_key], expected_type):
+            # Exact type match is the common case, so check it before the slower isinstance
+            if type(loaded_value) is not expected_type and not isinstance(
+                loaded_value, expected_type
+            ):
                 logger.debug(
-                    f"""Expected {expected_key}:{expected_type}\n
-                    Received {expected_key}:{type(loaded_json_data[expected_key])}"""
+                    """Expected %s:%s\n
+                    Received %s:%s""",
+                    expected_key,
+                    expected_type,
+                    expected_key,
+                    type(loaded_value),
                 )
                 return (
                     False,
@@ -901,15 +1075,58 @@ class DataModel:
             list[Tuple[str, int, str]]: A list of tuples, each containing a category name, count of responses, and percentage of total responses.
         """
 
+        # The total is the same for every category, so only sum it once
+        total_responses = sum(self.response_counts.values())
+        if not is_including_missing_data:
+            total_responses -= self.sum_response_counts({pd.NA})
+
         formatted_categories_metrics = []
-        for category, responses in self.categorized_dict.items():
-            count = self.sum_response_counts(responses)
-            percentage = self.calculate_percentage(responses, is_including_missing_data)
+        for category in self.categorized_dict:
+            count = self.category_counts[category]
+            percentage = self.calculate_percentage(count, total_responses)
             percentage_str = f"{percentage:.2f}%"
             formatted_categories_metrics.append((category, count, percentage_str))
 
         return formatted_categories_metrics
 
+    def add_to_categorized_dict(self, responses: set[str], category: str) -> None:
+        """
+        Adds responses to a category in `categorized_dict`, and adds the counts of the ones that weren't already in it to `category_counts`.
+
+        Args:
+            responses (set[str]): A set of responses to be added to the category.
+            category (str): The category to which the responses will be added.
+        """
+
+        new_responses = responses - self.categorized_dict[category]
+        self.categorized_dict[category].update(new_responses)
+        self.category_counts[category] += self.sum_response_counts(new_responses)
+
+    def remove_from_categorized_dict(self, responses: set[str], category: str) -> None:
+        """
+        Removes responses from a category in `categorized_dict`, and subtracts the counts of the ones that were in it from `category_counts`.
+
+        Args:
+            responses (set[str]): A set of responses to be removed from the category.
+            category (str): The category from which the responses will be removed.
+        """
+
+        removed_responses = responses & self.categorized_dict[category]
+        self.categorized_dict[category] -= removed_responses
+        self.category_counts[category] -= self.sum_response_counts(removed_responses)
+
+    def recount_categories(self) -> None:
+        """
+        Recalculates `category_counts` from scratch, from `categorized_dict` and `response_counts`.
+
+        Used when `categorized_dict` or `response_counts` are rebuilt, rather than changed incrementally.
+        """
+
+        self.category_counts = {
+            category: self.sum_response_counts(responses)
+            for category, responses in self.categorized_dict.items()
+        }
+
     def sum_response_counts(self, responses: set) -> int:
         """
         Sums the counts of a set of responses in the dataset.
@@ -923,26 +1140,16 @@ class DataModel:
 
         return sum(self.response_counts.get(response, 0) for response in responses)
 
-    def calculate_percentage(self, responses: set, is_including_missing_data: bool) -> float:
+    def calculate_percentage(self, count: int, total_responses: int) -> float:
         """
-        Calculates the percentage of responses for a category relative to the total number of responses in the dataset,
-        optionally including or excluding missing data.
+        Calculates the percentage of responses for a category relative to the total number of responses in the dataset.
 
         Args:
-            responses (set): A set of responses for which the percentage is calculated.
-            is_including_missing_data (bool): Whether to include missing data in the total responses count.
+            count (int): The count of responses in the category.
+            total_responses (int): The total count of responses in the dataset, with or without missing data.
 
         Returns:
             float: The calculated percentage.
         """
 
-        count = self.sum_response_counts(responses)
-
-        if is_including_missing_data:
-            total_responses = sum(self.response_counts.values())
-
-        else:
-            missing_data_count = self.sum_response_counts({pd.NA})
-            total_responses = sum(self.response_counts.values()) - missing_data_count
-
         return (count / total_responses) * 100 if total_responses > 0 else 0
@@ -3,70 +3,272 @@ This module provides a `FileHandler` class for the FuzzyMatcher application.
 
 Key functionalities:
     - Reading data from CSV or XLSX files and returning it as a pandas DataFrame.
-    - Loading data from JSON files and returning it as a dictionary.
-    - Exporting pandas DataFrames to CSV files.
+    - Loading data from JSON files (optionally zstandard compressed) and returning it as a dictionary.
+    - Exporting pandas DataFrames to CSV, Parquet or Feather files.
     - Saving data to JSON files.
+    - Writing files atomically, so a failed save or export never leaves a partly written file behind.
+    - Serializing pandas DataFrames to and from strings, for storing them inside JSON project files.
 
 Main dependenices:
     - `pandas`: for data manipulation.
-    - `chardet`: for detecting the character encoding of CSV files.
+    - `chardet`: for detecting the character encoding of CSV files that aren't utf-8.
+    - `codecs`: for recognizing byte order marks and utf-8 files.
     - `json`: for parsing and saving JSON files.
+    - `orjson` (optional): for loading and saving JSON files faster.
+    - `pysimdjson` (optional): for loading large JSON files faster.
+    - `zstandard` (optional): for compressed JSON project files.
+    - `python-calamine` (optional): for reading XLSX files faster.
+    - `pyarrow`: for fast CSV parsing and writing, Parquet and Feather exports, and serializing DataFrames to Parquet.
+    - `base64`: for storing the binary Parquet data as text.
 
 Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
 """
 
 import logging
-import chardet
+import base64
+import codecs
+import threading
+from chardet.universaldetector import UniversalDetector
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pa_compute
+import pyarrow.csv as pa_csv
+import os
 import json
-from typing import Any
+from collections import OrderedDict
+from contextlib import contextmanager
+from io import BytesIO, StringIO
+from typing import Any, BinaryIO, Callable, Iterable, Iterator
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard library json module is used without it
+    orjson = None
+
+try:
+    import simdjson
+# pysimdjson is optional, orjson or the standard library json module are used without it
+except ImportError:
+    simdjson = None
+
+# Below this size, the overhead of calling into simdjson outweighs its faster parsing
+_SIMDJSON_MIN_SIZE = 65536
+
+# One simdjson parser per thread, reused so its internal buffers aren't reallocated on every load.
+# A parser can't be shared between threads, as each parse invalidates the documents from the one before.
+_simdjson_parsers = threading.local()
+
+try:
+    import zstandard
+except ImportError:  # zstandard is optional, only needed for compressed project files
+    zstandard = None
+
+# Project files ending in this are zstandard compressed JSON
+_COMPRESSED_JSON_EXTENSION = ".json.zst"
+
+try:
+    import python_calamine  # noqa: F401
+
+    # Rust based reader, much faster than openpyxl's pure Python XML parsing
+    _EXCEL_ENGINE = "calamine"
+except ImportError:  # python-calamine is optional, openpyxl is used without it
+    _EXCEL_ENGINE = "openpyxl"
 
 logger = logging.getLogger(__name__)
 
+# pyarrow parses CSV blocks in parallel, so files are split into about one block per CPU, within these bounds
+_PYARROW_CSV_MIN_BLOCK_SIZE = 1024 * 1024
+_PYARROW_CSV_MAX_BLOCK_SIZE = 16 * 1024 * 1024
+
+# The strings pandas reads as missing data by default, so pyarrow reads the same ones as missing
+_CSV_NULL_VALUES = [
+    "",
+    "#N/A",
+    "#N/A N/A",
+    "#NA",
+    "-1.#IND",
+    "-1.#QNAN",
+    "-NaN",
+    "-nan",
+    "1.#IND",
+    "1.#QNAN",
+    "<NA>",
+    "N/A",
+    "NA",
+    "NULL",
+    "NaN",
+    "None",
+    "n/a",
+    "nan",
+    "null",
+]
+
+# The number of most recently read data files kept in memory, so reading one again doesn't parse it again.
+# The cache is also limited by the memory its DataFrames use, so it can't hold on to much memory for a large file
+# that is only read once.
+_READ_CACHE_SIZE = 2
+_READ_CACHE_MAX_BYTES = 128 * 1024 * 1024
+
+# CSV exports are written in many small batches, so a larger buffer than the default 8 KB saves a lot of write calls
+_WRITE_BUFFER_SIZE = 1024 * 1024
+
+# CSV files are read as this if they can't be decoded in the encoding detected for them.
+# It is the default encoding of Excel's CSV exports on Western European Windows, where most non utf-8 files come from.
+_FALLBACK_CSV_ENCODING = "cp1252"
+
+# Text containing any of these has to be quoted in a CSV file
+_CSV_QUOTED_CHARACTERS_PATTERN = r'[,"\r\n]'
+
+# chardet is fed the sample in chunks of this size, and stops once it is confident
+_CHARDET_CHUNK_SIZE = 8192
+
+# Byte order marks and the encodings they mark. UTF-32 must be checked before UTF-16, as they share a prefix.
+_BYTE_ORDER_MARKS = [
+    (codecs.BOM_UTF32_LE, "utf-32"),
+    (codecs.BOM_UTF32_BE, "utf-32"),
+    (codecs.BOM_UTF8, "utf-8-sig"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+]
+
 
 class FileHandler:
     """
     A class for handling file operations.
 
+    Attributes:
+        - `read_cache` (OrderedDict[tuple[str, int, int], tuple[pd.DataFrame, int]]): The most recently read data files,
+            and the memory used by each in bytes. Keyed by their absolute path, modification time and size,
+            least recently used first.
+        - `data_file_readers` (dict[str, Callable[..., pd.DataFrame]]): The method for reading each supported data file
+            extension (lowercase).
+        - `data_file_writers` (dict[str, Callable[[str, pd.DataFrame], None]]): The method for exporting to each supported
+            file extension (lowercase).
+
     Methods:
         - `__init__`: Initializes the `FileHandler` object.
-        - `read_csv_or_xlsx_to_dataframe`: Reads data from a CSV or XLSX file and returns it as a pandas DataFrame.
+        - `read_csv_or_xlsx_to_dataframe`: Reads data from a CSV or XLSX file and returns it as a pandas DataFrame, or in chunks.
+        - `read_csv_file`: Reads a whole CSV file, after detecting its encoding.
+        - `parse_csv_file`: Parses an open CSV file, with the fastest parser that can handle it.
+        - `read_xlsx_file`: Reads a whole XLSX file.
+        - `read_csv_with_pyarrow`: Reads a CSV file directly with pyarrow.
+        - `detect_encoding`: Detects the character encoding of a file from a sample at the start of it.
         - `load_json`: Loads data from a JSON file and returns it as a dictionary.
-        - `export_dataframe_to_csv`: Exports a pandas DataFrame to a CSV file.
+        - `parse_json`: Parses JSON with the fastest parser available.
+        - `export_dataframe`: Exports a pandas DataFrame to a CSV, Parquet or Feather file, depending on the file extension.
+        - `export_dataframe_to_parquet`: Exports a pandas DataFrame to a Parquet file.
+        - `export_dataframe_to_feather`: Exports a pandas DataFrame to a Feather file.
+        - `export_dataframe_to_csv`: Exports a pandas DataFrame, or chunks of one, to a CSV file.
+        - `write_csv_chunk`: Writes a pandas DataFrame to an open CSV file.
+        - `can_write_csv_with_pyarrow`: Checks whether pyarrow writes an Arrow table to CSV the same as pandas does.
         - `save_data_to_json`: Saves data to a JSON file.
+        - `open_for_atomic_write`: Opens a temporary file that replaces the given file once it has been written.
+        - `check_json_file_path`: Checks that a file path is for a JSON file, and whether it is compressed.
+        - `serialize_dataframe`: Serializes a pandas DataFrame to a string, as base64 encoded Parquet.
+        - `deserialize_dataframe`: Deserializes a string created by `serialize_dataframe` back into a pandas DataFrame.
     """
 
     def __init__(self) -> None:
         logger.info("Initializing file handler")
 
-    def read_csv_or_xlsx_to_dataframe(self, file_path: str) -> pd.DataFrame:
+        self.read_cache: OrderedDict[tuple[str, int, int], tuple[pd.DataFrame, int]] = OrderedDict()
+        self.data_file_readers: dict[str, Callable[..., pd.DataFrame]] = {
+            ".csv": self.read_csv_file,
+            ".xlsx": self.read_xlsx_file,
+        }
+        self.data_file_writers: dict[str, Callable[[str, pd.DataFrame], None]] = {
+            ".csv": self.export_dataframe_to_csv,
+            ".parquet": self.export_dataframe_to_parquet,
+            ".feather": self.export_dataframe_to_feather,
+        }
+
+    def read_csv_or_xlsx_to_dataframe(
+        self,
+        file_path: str,
+        chunksize: int | None = None,
+        *,
+        usecols: list[str] | None = None,
+        dtype: dict[str, Any] | None = None,
+        nrows: int | None = None,
+    ) -> pd.DataFrame | Iterator[pd.DataFrame]:
         """
         Reads data from a CSV or XLSX file and returns it as a pandas DataFrame.
 
+        When the caller already knows what it needs from the file, `usecols`, `dtype` and `nrows` are passed on to the
+        parser, so unused columns are never converted and type inference is skipped for the given columns.
+
+        Whole files are cached, so reading the same file again returns a copy of the cached DataFrame without parsing it,
+        unless the file has been modified since. Files too large to keep in memory aren't cached.
+
         Args:
             file_path (str): The path of the CSV or XLSX file to be read.
+            chunksize (int | None, optional): If given, a CSV file is read lazily in DataFrames of this many rows,
+                so large files never need to be held in memory all at once. Defaults to None.
+            usecols (list[str] | None, optional): The names of the columns to read. Defaults to None, for all columns.
+            dtype (dict[str, Any] | None, optional): The dtypes of columns, by name. Defaults to None, to infer them.
+            nrows (int | None, optional): The number of rows to read. Defaults to None, for all rows.
 
         Returns:
-            pd.DataFrame: The DataFrame containing data read from the file.
+            pd.DataFrame | Iterator[pd.DataFrame]: The DataFrame containing data read from the file,
+                or an iterator of DataFrames if `chunksize` is given.
 
         Raises:
-            ValueError: If the file format is not supported (.csv or .xlsx).
+            ValueError: If the file format is not supported (.csv or .xlsx), or `chunksize` is given for an XLSX file.
             Exception: If any other error occurs during file reading.
         """
 
         try:
             logger.info('Reading csv or xlsx file: "%s"', file_path)
 
-            if file_path.endswith(".csv"):
-                with open(file_path, "rb") as file:
-                    encoding = chardet.detect(file.read())["encoding"]  # Detect encoding
-                df = pd.read_csv(file_path, encoding=encoding)
+            # Extensions are matched case-insensitively, as files from Windows are often named .CSV or .XLSX
+            extension = os.path.splitext(file_path)[1].lower()
+            reader = self.data_file_readers.get(extension)
+            if reader is None:
+                raise ValueError("Unsupported file format.\n\nFile must be of type .csv or .xlsx")
 
-            elif file_path.endswith(".xlsx"):
-                df = pd.read_excel(file_path, engine="openpyxl")
+            if chunksize is not None:
+                if extension != ".csv":
+                    raise ValueError("Only .csv files can be read in chunks")
 
-            else:
-                raise ValueError("Unsupported file format.\n\nFile must be of type .csv or .xlsx")
+                with open(file_path, "rb") as file:
+                    encoding = self.detect_encoding(file)
+                # pandas' pyarrow engine can't read in chunks, so this uses the C parser.
+                # The reader is returned lazily, so it opens the file itself rather than using the closed handle.
+                return pd.read_csv(
+                    file_path,
+                    encoding=encoding,
+                    chunksize=chunksize,
+                    usecols=usecols,
+                    dtype=dtype,
+                    nrows=nrows,
+                )
+
+            cache_key = None
+            if usecols is None and dtype is None and nrows is None:
+                # A modified file has a new modification time or size, so it misses the cache
+                file_stat = os.stat(file_path)
+                cache_key = (os.path.abspath(file_path), file_stat.st_mtime_ns, file_stat.st_size)
+                if cache_key in self.read_cache:
+                    logger.info("File read from cache")
+                    self.read_cache.move_to_end(cache_key)
+                    # Copied so the caller can modify the DataFrame without changing the cached one
+                    return self.read_cache[cache_key][0].copy()
+
+            df = reader(file_path, usecols=usecols, dtype=dtype, nrows=nrows)
+
+            if cache_key is not None:
+                # Measured deeply, as most of the memory of survey data is in the response strings
+                df_size = int(df.memory_usage(deep=True).sum())
+                # A file too large to keep isn't cached, rather than evicting everything else for it
+                if df_size <= _READ_CACHE_MAX_BYTES:
+                    self.read_cache[cache_key] = (df, df_size)
+                    while (
+                        len(self.read_cache) > _READ_CACHE_SIZE
+                        or sum(size for _, size in self.read_cache.values()) > _READ_CACHE_MAX_BYTES
+                    ):
+                        self.read_cache.popitem(last=False)
+                    # Copied so the caller can modify the DataFrame without changing the cached one
+                    df = df.copy()
 
             logger.info("File read successfully")
             return df
@@ -75,28 +277,290 @@ class FileHandler:
             logger.exception("")
             raise
 
+    def read_csv_file(
+        self,
+        file_path: str,
+        usecols: list[str] | None = None,
+        dtype: dict[str, Any] | None = None,
+        nrows: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Reads a whole CSV file with the fastest parser that can handle it, after detecting its encoding.
+
+        The encoding is detected from a sample at the start of the file. If the file turns out not to be valid in that
+        encoding further on, it is detected again from the whole file, and read again.
+
+        Args:
+            file_path (str): The path of the CSV file to be read.
+            usecols (list[str] | None, optional): The names of the columns to read. Defaults to None, for all columns.
+            dtype (dict[str, Any] | None, optional): The dtypes of columns, by name. Defaults to None, to infer them.
+            nrows (int | None, optional): The number of rows to read. Defaults to None, for all rows.
+
+        Returns:
+            pd.DataFrame: The DataFrame containing data read from the file.
+        """
+
+        # One handle is used for both detecting the encoding and parsing, rather than opening the file twice.
+        # The file is memory mapped, so pyarrow reads it straight from the page cache without copying it
+        # through Python file reads.
+        with pa.memory_map(file_path) as file:
+            encoding = self.detect_encoding(file)
+            try:
+                return self.parse_csv_file(file, encoding, usecols, dtype, nrows)
+
+            except UnicodeDecodeError:
+                # e.g. a cp1252 file with only ascii characters in the sample, and an accented character after it
+                retry_encoding = self.detect_encoding(file, sample_size=file.size())
+                if retry_encoding == encoding:
+                    retry_encoding = _FALLBACK_CSV_ENCODING
+                logger.warning(
+                    "Could not decode the csv as %s, reading it as %s", encoding, retry_encoding
+                )
+                return self.parse_csv_file(file, retry_encoding, usecols, dtype, nrows)
+
+    def parse_csv_file(
+        self,
+        file: pa.NativeFile | BinaryIO,
+        encoding: str,
+        usecols: list[str] | None = None,
+        dtype: dict[str, Any] | None = None,
+        nrows: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Parses an open CSV file with the fastest parser that can handle it.
+
+        Args:
+            file (pa.NativeFile | BinaryIO): The CSV file to be parsed, opened in binary mode and at the start.
+            encoding (str): The character encoding of the file.
+            usecols (list[str] | None, optional): The names of the columns to read. Defaults to None, for all columns.
+            dtype (dict[str, Any] | None, optional): The dtypes of columns, by name. Defaults to None, to infer them.
+            nrows (int | None, optional): The number of rows to read. Defaults to None, for all rows.
+
+        Returns:
+            pd.DataFrame: The DataFrame containing data read from the file.
+
+        Raises:
+            UnicodeDecodeError: If the file isn't valid in the given encoding.
+        """
+
+        try:
+            # pyarrow can't stop after a number of rows, but the C parser can, which is quicker
+            # than parsing the whole file
+            if nrows is not None:
+                return pd.read_csv(
+                    file, encoding=encoding, usecols=usecols, dtype=dtype, nrows=nrows
+                )
+            # pyarrow's multithreaded parser is much faster than the default C parser
+            return self.read_csv_with_pyarrow(file, encoding, usecols, dtype)
+
+        except pa.ArrowInvalid:
+            # The C parser handles some malformed files, and gives clearer errors for the ones it can't
+            logger.warning("pyarrow could not parse the csv, falling back to the C parser")
+            file.seek(0)
+            return pd.read_csv(file, encoding=encoding, usecols=usecols, dtype=dtype, nrows=nrows)
+
+    def read_xlsx_file(
+        self,
+        file_path: str,
+        usecols: list[str] | None = None,
+        dtype: dict[str, Any] | None = None,
+        nrows: int | None = None,
+    ) -> pd.DataFrame:
+        """
+        Reads a whole XLSX file.
+
+        Args:
+            file_path (str): The path of the XLSX file to be read.
+            usecols (list[str] | None, optional): The names of the columns to read. Defaults to None, for all columns.
+            dtype (dict[str, Any] | None, optional): The dtypes of columns, by name. Defaults to None, to infer them.
+            nrows (int | None, optional): The number of rows to read. Defaults to None, for all rows.
+
+        Returns:
+            pd.DataFrame: The DataFrame containing data read from the file.
+        """
+
+        return pd.read_excel(
+            file_path, engine=_EXCEL_ENGINE, usecols=usecols, dtype=dtype, nrows=nrows
+        )
+
+    def read_csv_with_pyarrow(
+        self,
+        file: pa.NativeFile | BinaryIO,
+        encoding: str,
+        usecols: list[str] | None = None,
+        dtype: dict[str, Any] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Reads a CSV file directly with pyarrow and converts it to a pandas DataFrame.
+
+        Skips the option translation pandas does for its pyarrow engine, and lets the conversion to pandas
+        free the Arrow buffers as it goes, so large files don't need two full copies in memory.
+
+        Files in encodings other than utf-8 are decoded by Python as pyarrow reads them, which raises a
+        `UnicodeDecodeError` if they aren't valid. pyarrow reads utf-8 columns that aren't valid as raw bytes instead,
+        so these are rejected with the same error.
+
+        The data is the same as pandas' default C parser reads. pyarrow's type inference only agrees with it for text and
+        integer columns though. It reads dates and times as timestamps, and integers too large for int64 as floats,
+        changing the text of the responses. Columns of any other type are parsed again with the C parser, which
+        is rarely needed, as survey data is mostly text responses and integer ids. Files with duplicate or blank
+        column names, or no rows, are rejected, so they are read by the C parser, which names and types their
+        columns differently.
+
+        Args:
+            file (pa.NativeFile | BinaryIO): The CSV file to be read, opened in binary mode.
+                A pyarrow `NativeFile`, such as a memory map, is read without going through Python.
+            encoding (str): The character encoding of the file.
+            usecols (list[str] | None, optional): The names of the columns to read. Defaults to None, for all columns.
+            dtype (dict[str, Any] | None, optional): The pandas dtypes of columns, by name. Defaults to None, to infer them.
+
+        Returns:
+            pd.DataFrame: The DataFrame containing data read from the file.
+
+        Raises:
+            pyarrow.ArrowInvalid: If pyarrow can't parse the file, or reads it differently to the C parser.
+            UnicodeDecodeError: If the file isn't valid in the given encoding.
+        """
+
+        file_size = file.seek(0, os.SEEK_END)
+        file.seek(0)
+        block_size = -(-file_size // (os.cpu_count() or 1))
+        block_size = min(max(block_size, _PYARROW_CSV_MIN_BLOCK_SIZE), _PYARROW_CSV_MAX_BLOCK_SIZE)
+
+        table = pa_csv.read_csv(
+            file,
+            read_options=pa_csv.ReadOptions(
+                encoding=encoding, use_threads=True, block_size=block_size
+            ),
+            # Free text responses can contain line breaks
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+            # Columns not in usecols are skipped while parsing, rather than dropped afterwards
+            convert_options=pa_csv.ConvertOptions(
+                null_values=_CSV_NULL_VALUES, strings_can_be_null=True, include_columns=usecols
+            ),
+        )
+
+        # The C parser renames duplicate columns, which pyarrow doesn't, and which couldn't be parsed again by name
+        if len(set(table.column_names)) < table.num_columns:
+            raise pa.ArrowInvalid("CSV file has duplicate column names")
+
+        # The C parser names blank header cells "Unnamed: N", which Excel writes for rows with a trailing delimiter
+        if "" in table.column_names:
+            raise pa.ArrowInvalid("CSV file has blank column names")
+
+        # pyarrow reads the columns of a file with no rows as empty, which become floats, but the C parser as text
+        if table.num_rows == 0:
+            raise pa.ArrowInvalid("CSV file has no rows")
+
+        undecodable_columns = [
+            field.name for field in table.schema if pa.types.is_binary(field.type)
+        ]
+        if undecodable_columns:
+            raise UnicodeDecodeError(
+                encoding, b"", 0, 0, f"invalid data in columns {undecodable_columns}"
+            )
+
+        reparse_columns = []
+        missing_text_columns = []
+        for i, field in enumerate(table.schema):
+            # Empty columns are floats of all NaN in pandas
+            if pa.types.is_null(field.type):
+                table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+            elif pa.types.is_string(field.type):
+                if table.column(i).null_count:
+                    missing_text_columns.append(field.name)
+            elif not pa.types.is_int64(field.type):
+                reparse_columns.append(field.name)
+
+        df = table.to_pandas(split_blocks=True, self_destruct=True)
+
+        # Missing text is None when converted from Arrow, but NaN in pandas
+        for column in missing_text_columns:
+            df[column] = df[column].fillna(float("nan"))
+
+        if reparse_columns:
+            logger.debug("Parsing columns %s again with the C parser", reparse_columns)
+            file.seek(0)
+            reparsed_df = pd.read_csv(file, encoding=encoding, usecols=reparse_columns, dtype=dtype)
+            df[reparse_columns] = reparsed_df[reparse_columns]
+
+        # pandas dtypes don't all have an Arrow equivalent to parse into, so they are applied after converting
+        return df.astype(dtype) if dtype else df
+
+    def detect_encoding(self, file: pa.NativeFile | BinaryIO, sample_size: int = 65536) -> str:
+        """
+        Detects the character encoding of a file from a sample at the start of it, rather than reading the whole file.
+
+        Files with a byte order mark, and ascii or utf-8 files (the vast majority), are recognized directly.
+        chardet is only used for anything else, as it is slow.
+
+        Args:
+            file (pa.NativeFile | BinaryIO): The file, opened in binary mode. It is rewound to the start afterwards, ready to be parsed.
+            sample_size (int, optional): The number of bytes to sample. Defaults to 64 KB.
+
+        Returns:
+            str: The name of the detected encoding.
+        """
+
+        sample = file.read(sample_size)
+        file.seek(0)
+
+        for bom, encoding in _BYTE_ORDER_MARKS:
+            if sample.startswith(bom):
+                logger.debug("Detected encoding from byte order mark: %s", encoding)
+                return encoding
+
+        # An ascii sample doesn't mean the rest of the file is ascii, but utf-8 is a superset of it that reads both
+        if sample.isascii():
+            return "utf-8"
+
+        try:
+            # Incremental decoding, as the sample can end part way through a multi-byte character
+            codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+            return "utf-8"
+        except UnicodeDecodeError:
+            pass
+
+        # Feed chardet the sample in chunks, so it can stop as soon as it is confident
+        detector = UniversalDetector()
+        for chunk_start in range(0, len(sample), _CHARDET_CHUNK_SIZE):
+            detector.feed(sample[chunk_start : chunk_start + _CHARDET_CHUNK_SIZE])
+            if detector.done:
+                break
+        result = detector.close()
+
+        # The sample isn't utf-8 at this point, so even a low confidence guess is better than defaulting to it
+        encoding = result["encoding"] or "utf-8"
+        logger.debug("Detected encoding: %s (confidence %s)", encoding, result["confidence"])
+        return encoding
+
     def load_json(self, file_path: str) -> dict[str, Any]:
         """
         Loads data from a JSON file and returns it as a dictionary.
 
         Args:
-            file_path (str): The path of the JSON file to be read.
+            file_path (str): The path of the JSON file to be read. Files ending in .json.zst are decompressed first.
 
         Returns:
             dict[str, Any]: The dictionary containing data read from the file.
 
         Raises:
-            ValueError: If the file format is not .json.
+            ValueError: If the file format is not .json or .json.zst.
             Exception: If any other error occurs during file reading.
         """
 
         try:
-            if not file_path.endswith(".json"):
-                raise ValueError("Unsupported file format.\n\nFile must be of type .json")
+            is_compressed = self.check_json_file_path(file_path)
 
             logger.info('Loading json file: "%s"', file_path)
-            with open(file_path, "r") as f:
-                data = json.load(f) or {}  # Return empty dict if empty json
+            # Saved JSON files are always utf-8 (orjson doesn't escape non-ascii characters)
+            with open(file_path, "rb") as f:
+                if is_compressed:
+                    json_bytes = zstandard.ZstdDecompressor().stream_reader(f).read()
+                else:
+                    json_bytes = f.read()
+
+            data = self.parse_json(json_bytes) or {}  # Return empty dict if empty json
 
             logger.info("File loaded successfully")
             return data
@@ -105,48 +569,227 @@ class FileHandler:
             logger.exception("")
             raise
 
-    def export_dataframe_to_csv(self, file_path: str, export_df: pd.DataFrame) -> None:
+    def parse_json(self, json_bytes: bytes) -> Any:
+        """
+        Parses JSON with the fastest parser available.
+
+        Large files are parsed with simdjson, and everything else with orjson, if they are installed.
+        The simdjson parser is reused between calls on the same thread.
+        Falls back to the standard library json module.
+
+        Args:
+            json_bytes (bytes): The utf-8 encoded JSON to be parsed.
+
+        Returns:
+            Any: The parsed JSON data.
+        """
+
+        try:
+            if simdjson is not None and len(json_bytes) >= _SIMDJSON_MIN_SIZE:
+                parser = getattr(_simdjson_parsers, "parser", None)
+                if parser is None:
+                    parser = _simdjson_parsers.parser = simdjson.Parser()
+                # Parse recursively into plain Python objects, which stay valid after the parser is reused
+                return parser.parse(json_bytes, True)
+            if orjson is not None:
+                return orjson.loads(json_bytes)
+
+        except ValueError:
+            # simdjson and orjson are strict, but json.dump can write NaN and Infinity, which the json module reads back
+            logger.debug("Falling back to the json module to parse JSON")
+
+        return json.loads(json_bytes.decode("utf-8"))
+
+    def export_dataframe(
+        self, file_path: str, export_df: pd.DataFrame | Iterable[pd.DataFrame]
+    ) -> None:
+        """
+        Exports a pandas DataFrame to a file, in the format given by the file extension.
+
+        CSV is what most users need, to open in Excel or import into Q. Parquet and Feather are binary columnar formats,
+        which are much smaller and faster to write and read back than CSV, as values aren't formatted as text.
+
+        Args:
+            file_path (str): The path where the file will be saved. Must end in .csv, .parquet or .feather.
+            export_df (pd.DataFrame | Iterable[pd.DataFrame]): The DataFrame to be exported.
+                CSV files can also be exported from an iterable of DataFrame chunks (see `export_dataframe_to_csv`).
+
+        Raises:
+            pd.errors.EmptyDataError: If the DataFrame is empty.
+            ValueError: If the file format is not supported.
+            Exception: If any other error occurs during file writing.
+        """
+
+        if file_path.lower().endswith(".csv"):
+            # The CSV export validates the DataFrame itself, as it can be given chunks that aren't read until written
+            self.export_dataframe_to_csv(file_path, export_df)
+            return
+
+        try:
+            if export_df.empty:
+                logger.error("Dataframe is empty")
+                logger.debug("export_df:\n%s", export_df)
+                raise pd.errors.EmptyDataError("Dataframe is empty")
+
+            writer = self.data_file_writers.get(os.path.splitext(file_path)[1].lower())
+            if writer is None:
+                raise ValueError(
+                    "Unsupported file format.\n\nFile must be of type .csv, .parquet or .feather"
+                )
+
+            writer(file_path, export_df)
+
+        except Exception:
+            logger.exception("")
+            raise
+
+    def export_dataframe_to_parquet(self, file_path: str, export_df: pd.DataFrame) -> None:
+        """
+        Exports a pandas DataFrame to a zstandard compressed Parquet file.
+
+        Args:
+            file_path (str): The path where the Parquet file will be saved.
+            export_df (pd.DataFrame): The DataFrame to be exported.
+        """
+
+        logger.info('Exporting data to parquet: "%s"', file_path)
+        with self.open_for_atomic_write(file_path) as f:
+            export_df.to_parquet(f, engine="pyarrow", compression="zstd", index=False)
+        logger.info("Data exported to parquet successfully")
+
+    def export_dataframe_to_feather(self, file_path: str, export_df: pd.DataFrame) -> None:
+        """
+        Exports a pandas DataFrame to a zstandard compressed Feather file.
+
+        Args:
+            file_path (str): The path where the Feather file will be saved.
+            export_df (pd.DataFrame): The DataFrame to be exported.
+        """
+
+        logger.info('Exporting data to feather: "%s"', file_path)
+        with self.open_for_atomic_write(file_path) as f:
+            # Feather can't store a non-default index, and the index isn't part of the exported data anyway
+            export_df.reset_index(drop=True).to_feather(f, compression="zstd")
+        logger.info("Data exported to feather successfully")
+
+    def export_dataframe_to_csv(
+        self, file_path: str, export_df: pd.DataFrame | Iterable[pd.DataFrame]
+    ) -> None:
         """
         Exports a pandas DataFrame to a CSV file.
 
         Args:
             file_path (str): The path where the CSV file will be saved.
-            export_df (pd.DataFrame): The DataFrame to be exported to a CSV file.
+            export_df (pd.DataFrame | Iterable[pd.DataFrame]): The DataFrame to be exported to a CSV file.
+                Can also be an iterable of DataFrame chunks with the same columns, which are written one after another
+                so the whole DataFrame never needs to be held in memory.
 
         Raises:
-            pd.errors.EmptyDataError: If the DataFrame is empty.
+            pd.errors.EmptyDataError: If the DataFrame (or the first chunk) is empty.
             ValueError: If the file format is not .csv.
             Exception: If any other error occurs during file writing.
         """
 
         try:
-            if export_df.empty:
+            chunks = iter([export_df] if isinstance(export_df, pd.DataFrame) else export_df)
+            first_chunk = next(chunks, pd.DataFrame())
+
+            if first_chunk.empty:
                 logger.error("Dataframe is empty")
-                logger.debug(f"export_df:\n{export_df}")
+                logger.debug("export_df:\n%s", first_chunk)
                 raise pd.errors.EmptyDataError("Dataframe is empty")
 
-            if not file_path.endswith(".csv"):
+            if not file_path.lower().endswith(".csv"):
                 raise ValueError("Unsupported file format.\n\nFile must be of type .csv")
 
             logger.info('Exporting data to csv: "%s"', file_path)
-            export_df.to_csv(file_path, index=False)
+            with self.open_for_atomic_write(file_path, buffering=_WRITE_BUFFER_SIZE) as f:
+                self.write_csv_chunk(first_chunk, f, include_header=True)
+                # Append any further chunks without repeating the header
+                for chunk in chunks:
+                    self.write_csv_chunk(chunk, f, include_header=False)
             logger.info("Data exported to csv successfully")
 
         except Exception:
             logger.exception("")
             raise
 
+    def write_csv_chunk(self, df: pd.DataFrame, file: BinaryIO, include_header: bool) -> None:
+        """
+        Writes a pandas DataFrame to an open CSV file, the same as `DataFrame.to_csv` does.
+
+        Integer and text columns are written with pyarrow's CSV writer, which is much faster than `DataFrame.to_csv`.
+        pyarrow formats other types differently (e.g. floats as 1 rather than 1.0), can only quote all text or none
+        of it, and always uses Unix line endings, so DataFrames with other columns or with text that needs quoting, and any
+        DataFrame on Windows, are written with `DataFrame.to_csv`.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to be written.
+            file (BinaryIO): The CSV file, opened in binary mode.
+            include_header (bool): Whether to write the column names before the data.
+        """
+
+        # pyarrow quotes every column name, so the header is always written by pandas
+        if include_header:
+            df.head(0).to_csv(file, index=False)
+
+        try:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+        except pa.ArrowException:
+            # e.g. object columns of mixed types
+            table = None
+
+        # pyarrow always ends lines with \n, whereas to_csv uses os.linesep (\r\n on Windows)
+        if table is None or os.linesep != "\n" or not self.can_write_csv_with_pyarrow(table):
+            logger.debug("Writing csv chunk with to_csv")
+            df.to_csv(file, header=False, index=False)
+            return
+
+        pa_csv.write_csv(
+            table,
+            file,
+            write_options=pa_csv.WriteOptions(include_header=False, quoting_style="none"),
+        )
+
+    def can_write_csv_with_pyarrow(self, table: pa.Table) -> bool:
+        """
+        Checks whether pyarrow writes an Arrow table to CSV the same as `DataFrame.to_csv` does, without quoting anything.
+
+        Args:
+            table (pa.Table): The table to be written.
+
+        Returns:
+            bool: True if every column is integers or text that doesn't need quoting.
+        """
+
+        # A row of a single empty value is quoted by pandas, so it isn't mistaken for a blank line
+        if table.num_columns < 2:
+            return False
+
+        for column in table.columns:
+            if pa.types.is_integer(column.type):
+                continue
+            if not (pa.types.is_string(column.type) or pa.types.is_large_string(column.type)):
+                return False
+            if pa_compute.any(
+                pa_compute.match_substring_regex(column, _CSV_QUOTED_CHARACTERS_PATTERN)
+            ).as_py():
+                return False
+
+        return True
+
     def save_data_to_json(self, file_path: str, data_to_save: dict[str, Any], handler=None) -> None:
         """
         Saves data to a JSON file.
 
         Args:
-            file_path (str): The path where the JSON file will be saved.
+            file_path (str): The path where the JSON file will be saved. Files ending in .json.zst are compressed with zstandard,
+                which shrinks project files several times over and is fast enough to make saving and loading quicker overall.
             data_to_save (dict[str, Any]): The data to be saved to a JSON file.
             handler (optional): A function to handle encoding of complex objects.
 
         Raises:
-            ValueError: If the data to save is empty or the file format is not .json.
+            ValueError: If the data to save is empty or the file format is not .json or .json.zst.
             Exception: If any other error occurs during file writing.
         """
 
@@ -155,17 +798,133 @@ class FileHandler:
 
             if not data_to_save:
                 logger.error("Project data is empty")
-                logger.debug(f"data_to_save:{data_to_save}")
+                logger.debug("data_to_save:%s", data_to_save)
                 raise ValueError("Project data is empty")
 
-            if not file_path.endswith(".json"):
-                raise ValueError("Unsupported file format.\n\nFile must be of type .json")
+            is_compressed = self.check_json_file_path(file_path)
+
+            if orjson is not None:
+                # Much faster than json.dump on the large dicts of project data.
+                # Keys that aren't strings (e.g. None for missing data) are converted the same way json.dump does.
+                json_bytes = orjson.dumps(
+                    data_to_save,
+                    default=handler,
+                    option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                )
+            else:
+                json_bytes = json.dumps(data_to_save, default=handler).encode("utf-8")
+
+            if is_compressed:
+                json_bytes = zstandard.ZstdCompressor(level=3).compress(json_bytes)
 
-            with open(file_path, "w") as f:
-                json.dump(data_to_save, f, default=handler)
+            with self.open_for_atomic_write(file_path) as f:
+                f.write(json_bytes)
 
             logger.info("Data saved successfully")
 
         except Exception:
             logger.exception("")
             raise
+
+    @contextmanager
+    def open_for_atomic_write(self, file_path: str, buffering: int = -1) -> Iterator[BinaryIO]:
+        """
+        Opens a temporary file next to `file_path` for writing in binary mode. Once the `with` block finishes, the
+        temporary file replaces `file_path` in a single rename, so the file is never seen partly written.
+        If the block raises, the temporary file is deleted and any existing file at `file_path` is left untouched.
+
+        Args:
+            file_path (str): The path of the file to be written.
+            buffering (int, optional): The buffer size, as for `open`. Defaults to the default buffer size.
+
+        Yields:
+            BinaryIO: The temporary file.
+        """
+
+        # Kept in the same directory so the rename doesn't cross file systems
+        temp_file_path = f"{file_path}.{os.getpid()}.tmp"
+        try:
+            with open(temp_file_path, "wb", buffering=buffering) as f:
+                yield f
+            os.replace(temp_file_path, file_path)
+        except BaseException:
+            if os.path.exists(temp_file_path):
+                os.remove(temp_file_path)
+            raise
+
+    def check_json_file_path(self, file_path: str) -> bool:
+        """
+        Checks that a file path is for a JSON file, either plain or zstandard compressed.
+
+        Args:
+            file_path (str): The path of the JSON file.
+
+        Returns:
+            bool: Whether the file is compressed.
+
+        Raises:
+            ValueError: If the file format is not .json or .json.zst, or the file is compressed but zstandard isn't installed.
+        """
+
+        file_path = file_path.lower()
+        if file_path.endswith(_COMPRESSED_JSON_EXTENSION):
+            if zstandard is None:
+                raise ValueError(
+                    "Compressed project files (.json.zst) need the zstandard package to be installed"
+                )
+            return True
+
+        if not file_path.endswith(".json"):
+            raise ValueError("Unsupported file format.\n\nFile must be of type .json or .json.zst")
+
+        return False
+
+    def serialize_dataframe(self, df: pd.DataFrame) -> str:
+        """
+        Serializes a pandas DataFrame to a string, so it can be stored in a JSON file.
+
+        The DataFrame is written as Parquet and base64 encoded, which is much faster and smaller than JSON and keeps the dtypes
+        (e.g. categorical and nullable integer columns). Falls back to JSON for DataFrames that Parquet can't store,
+        such as object columns of mixed types.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to be serialized.
+
+        Returns:
+            str: The serialized DataFrame.
+        """
+
+        try:
+            buffer = BytesIO()
+            df.to_parquet(buffer, engine="pyarrow")
+            return base64.b64encode(buffer.getvalue()).decode("ascii")
+
+        except (pa.ArrowException, ValueError):
+            logger.warning("Could not serialize DataFrame to Parquet, falling back to JSON")
+            return df.to_json()
+
+    def deserialize_dataframe(self, serialized_df: str) -> pd.DataFrame:
+        """
+        Deserializes a string created by `serialize_dataframe` back into a pandas DataFrame.
+
+        Also accepts DataFrames serialized as JSON, as saved by older versions of the application.
+        Missing data is returned as pd.NA.
+
+        Args:
+            serialized_df (str): The serialized DataFrame.
+
+        Returns:
+            pd.DataFrame: The deserialized DataFrame.
+        """
+
+        # JSON objects start with a brace, which is never part of base64
+        if serialized_df.startswith("{"):
+            df = pd.read_json(StringIO(serialized_df))
+            # pd.NA is not JSON serializable so gets saved as None, need to load it back properly
+            return df.map(lambda x: pd.NA if x is None else x)
+
+        df = pd.read_parquet(BytesIO(base64.b64decode(serialized_df)), engine="pyarrow")
+        # Parquet returns missing strings as None
+        object_columns = df.columns[df.dtypes == object]
+        df[object_columns] = df[object_columns].where(df[object_columns].notna(), pd.NA)
+        return df
@@ -13,7 +13,7 @@ Main dependencies:
     - `tkinter`: for the GUI components.
     - `pandas`: for data manipulation.
     - `inspect`: for cleaner error message displays.
-    - `ctypes`: for DPI awareness, ensuring the UI scales correctly on high-resolution displays.
+    - `ctypes`: for DPI awareness on Windows, ensuring the UI scales correctly on high-resolution displays.
 
 Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
 """
@@ -21,15 +21,35 @@ Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
 import logging
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
-from typing import Tuple
+from typing import Any, Tuple
 import inspect
 import ctypes
+import sys
 import pandas as pd
 
 logger = logging.getLogger(__name__)
 
-# Set DPI awareness
-ctypes.windll.shcore.SetProcessDpiAwareness(1)
+# Height of a Treeview row in pixels
+_TREEVIEW_ROW_HEIGHT = 25
+
+# Rows beyond the first screenful are inserted into Treeviews in batches of this size while the UI is idle
+_TREEVIEW_INSERT_BATCH_SIZE = 500
+
+# A Treeview is updated in place when at most this many of its rows have changed, otherwise it is repopulated
+_TREEVIEW_MAX_IN_PLACE_CHANGES = 200
+
+# Resizing waits until the window hasn't been resized for this many milliseconds
+_RESIZE_DEBOUNCE_MS = 50
+
+# The frames holding the buttons, entries, slider and checkbox, which ignore input while a background task is running
+_INPUT_FRAME_POSITIONS = ("top_left", "bottom_left", "top_middle", "top_right", "bottom_right")
+
+# Set DPI awareness (only Windows has it, and only Windows 8.1 onwards has shcore)
+if sys.platform == "win32":
+    try:
+        ctypes.windll.shcore.SetProcessDpiAwareness(1)
+    except (AttributeError, OSError):
+        logger.warning("Could not set DPI awareness", exc_info=True)
 
 
 class FuzzyUI(tk.Tk):
@@ -38,17 +58,41 @@ class FuzzyUI(tk.Tk):
 
     Attributes:
         - `WINDOW_SIZE_MULTIPLIER` (float): Defines the size of the main window relative to the screen size.
+        - `POPUP_WIDTH` (int): The width of popup windows.
+        - `POPUP_HEIGHT` (int): The height of popup windows.
         - `is_including_missing_data` (tk.BooleanVar): A variable to track the inclusion of missing data when calculating category percentages for display.
         - `categorization_type` (tk.StringVar): A variable to track the type of categorization (Single or Multi)
             Single allows only one category per response, Multi allows multiple.
+        - `treeview_population_jobs` (dict[ttk.Treeview, str]): The scheduled job inserting the next batch of rows into each
+            Treeview that is still being populated.
+        - `pending_treeview_selections` (dict[ttk.Treeview, set[str]]): Values to select in each Treeview that is still
+            being populated, as their rows are inserted.
+        - `text_widgets` (list[tk.Widget]): The labels, buttons and radio buttons in the main window, whose text wraps.
+        - `treeviews` (list[ttk.Treeview]): The Treeviews in the main window.
+        - `applied_wraplengths` (dict[tk.Widget, int]): The wrap length last set on each text widget.
+        - `applied_treeview_widths` (dict[ttk.Treeview, int]): The Treeview width its columns were last sized for.
+        - `rename_dialog_popup` (tk.Toplevel | None): The rename category popup, once it has been created.
+        - `categorization_type_popup` (tk.Toplevel | None): The categorization type popup, once it has been created.
+        - `resize_job` (str | None): The scheduled job resizing widgets to fit the window, if the window is being resized.
+        - `window_dimensions` (Tuple[int, int] | None): The width and height of the main window from its last resize event.
+        - `treeview_values` (dict[ttk.Treeview, dict[str, Any]]): The value in the first column of each item in each Treeview,
+            by item id. Kept as items are inserted, so selections can be read without asking Tcl for each item's values.
+        - `treeview_rows` (dict[ttk.Treeview, list[Tuple]]): The rows each Treeview was last populated with.
 
     Methods:
         - `display_fuzzy_match_results`: Displays the results of fuzzy matching in the corresponding Treeview.
         - `display_category_results`: Displays the categorized results in the corresponding Treeview.
         - `display_categories`: Displays the list of categories and related metrics in the corresponding Treeview.
+        - `populate_treeview`: Replaces the rows of a Treeview, inserting those out of view in batches while the UI is idle.
+        - `insert_treeview_rows`: Inserts a batch of rows into a Treeview, and schedules the next batch.
         - `set_categorization_type_label`: Sets the label indicating the current categorization type.
+        - `hold_busy`: Makes the buttons, entries, slider and checkbox ignore input while a background task is running.
+        - `release_busy`: Makes the buttons, entries, slider and checkbox take input again.
         - `create_popup`: Creates a general purpose popup window.
-        - `create_rename_category_popup`: Creates a popup window for renaming a category.
+        - `show_popup`: Shows a popup window on top of the main window.
+        - `hide_popup`: Hides a popup window so it can be shown again later.
+        - `create_rename_category_popup`: Creates a popup window for renaming a category, or shows the existing one.
+        - `close_rename_category_popup`: Hides the rename category popup.
         - `create_ask_categorization_type_popup`: Creates a popup window for selecting the categorization type.
         - `show_open_file_dialog`: Displays a dialog to open a file.
         - `show_save_file_dialog`: Displays a dialog to save a file.
@@ -59,6 +103,7 @@ class FuzzyUI(tk.Tk):
         - `selected_match_responses`: Returns a set of selected responses from the match results Treeview.
         - `selected_category_responses`: Returns a set of selected responses from the category results Treeview.
         - `selected_categories`: Returns a set of selected categories from the categories Treeview.
+        - `selected_values`: Returns the first column values of the selected items in a Treeview.
         - `update_treeview_selections`: Updates the selections in Treeview widgets based on specified criteria.
     """
 
@@ -72,17 +117,31 @@ class FuzzyUI(tk.Tk):
 
         self.title("Fuzzy Matcher")
         self.WINDOW_SIZE_MULTIPLIER = 0.8
+        self.POPUP_WIDTH = 400
+        self.POPUP_HEIGHT = 200
         self.update_coords(self.winfo_screenwidth(), self.winfo_screenheight())
 
         # UI variables
         self.is_including_missing_data = tk.BooleanVar(value=False)
         self.categorization_type = tk.StringVar(value="Single")
 
+        self.resize_job: str | None = None
+        self.window_dimensions: Tuple[int, int] | None = None
+        self.rename_dialog_popup: tk.Toplevel | None = None
+        self.categorization_type_popup: tk.Toplevel | None = None
+
+        # Treeview population state
+        self.treeview_population_jobs: dict[ttk.Treeview, str] = {}
+        self.pending_treeview_selections: dict[ttk.Treeview, set[str]] = {}
+        self.treeview_values: dict[ttk.Treeview, dict[str, Any]] = {}
+        self.treeview_rows: dict[ttk.Treeview, list[Tuple]] = {}
+
         # Setup the UI
         self.initialize_window()
         self.configure_grid()
         self.configure_frames()
         self.create_widgets()
+        self.collect_resizable_widgets()
         self.position_widgets_in_frames()
         self.configure_sub_grids()
         self.configure_style()
@@ -108,6 +167,9 @@ class FuzzyUI(tk.Tk):
         self.window_height = int(screen_height * self.WINDOW_SIZE_MULTIPLIER)
         self.centre_x = int((screen_width - self.window_width) / 2)
         self.centre_y = int((screen_height - self.window_height) / 2)
+        self.popup_geometry = (
+            f"{self.POPUP_WIDTH}x{self.POPUP_HEIGHT}+{self.centre_x}+{self.centre_y}"
+        )
 
     def initialize_window(self) -> None:
         """
@@ -169,9 +231,14 @@ class FuzzyUI(tk.Tk):
         Creates various UI widgets (buttons, labels, entries, treeviews, etc.) and assigns them to frames.
         """
 
+        # Only the entries and treeviews are themed ttk widgets. The buttons and radio buttons stay classic tk, as
+        # `resize_text_wraplength` wraps their text with wraplength, which ttk.Button and ttk.Radiobutton don't have.
+        # The slider stays classic too, as ttk.Scale has no resolution and doesn't show its value. The labels, checkbox
+        # and scrollbars stay classic to match the widgets around them.
+
         # Top left frame widgets (fuzzy matching entry, slider, buttons and lable)
         self.match_string_label = tk.Label(self.frames["top_left"], text="Enter String to Match:")
-        self.match_string_entry = tk.Entry(self.frames["top_left"])
+        self.match_string_entry = ttk.Entry(self.frames["top_left"])
         self.threshold_label = tk.Label(
             self.frames["top_left"],
             text="Set Fuzz Threshold (100 is precise, 0 is imprecise):",
@@ -236,11 +303,10 @@ class FuzzyUI(tk.Tk):
         # Bottom middle frame widgets (None)
 
         # Top right frame widgets (category buttons and entry)
-        self.new_category_entry = tk.Entry(self.frames["top_right"])
+        self.new_category_entry = ttk.Entry(self.frames["top_right"])
         self.add_category_button = tk.Button(self.frames["top_right"], text="Add Category")
         self.rename_category_button = tk.Button(self.frames["top_right"], text="Rename Category")
         self.delete_categories_button = tk.Button(self.frames["top_right"], text="Delete Category")
-        self.delete_categories_button.bind()
         self.include_missing_data_checkbox = tk.Checkbutton(
             self.frames["top_right"],
             text="Base to total",
@@ -268,6 +334,22 @@ class FuzzyUI(tk.Tk):
         self.export_csv_button = tk.Button(self.frames["bottom_right"], text="Export to CSV")
         self.save_button = tk.Button(self.frames["bottom_right"], text="Save Project")
 
+    def collect_resizable_widgets(self) -> None:
+        """
+        Collects the widgets that are resized with the main window, so resizing doesn't have to search for them every time.
+        The widgets in the main window are all created up front, so the lists never change.
+        """
+
+        widgets = [widget for frame in self.frames.values() for widget in frame.winfo_children()]
+        self.text_widgets = [
+            widget
+            for widget in widgets
+            if isinstance(widget, (tk.Label, tk.Button, tk.Radiobutton))
+        ]
+        self.treeviews = [widget for widget in widgets if isinstance(widget, ttk.Treeview)]
+        self.applied_wraplengths: dict[tk.Widget, int] = {}
+        self.applied_treeview_widths: dict[ttk.Treeview, int] = {}
+
     def position_widgets_in_frames(self) -> None:
         """
         Positions the created widgets within their respective frames, defining layout properties.
@@ -333,24 +415,32 @@ class FuzzyUI(tk.Tk):
         Configures the grid layouts within individual frames, ensuring proper alignment and sizing of widgets.
         """
 
-        # Allow all buttons and treviews to expand/contract horizontally together
-        for frame in self.frames.values():
-            for col in range(frame.grid_size()[0]):
-                frame.grid_columnconfigure(col, weight=1)
-
-        for frame in [
+        treeview_frames = {
             self.frames["middle_left"],
             self.frames["middle_middle"],
             self.frames["middle_right"],
-        ]:
-            # Don't allow the scrollbars to expand horizontally
-            last_column = frame.grid_size()[0] - 1
-            frame.grid_columnconfigure(last_column, weight=0)
-            # Allow the treeviews to expand vertically
-            frame.grid_rowconfigure(0, weight=1)
+        }
+
+        # Build the whole layout as one Tcl script, rather than a call for each column of each frame
+        script = []
+        for frame in self.frames.values():
+            columns = frame.grid_size()[0]
+            # Allow all buttons and treviews to expand/contract horizontally together
+            # (grid takes a list of column indices, so this is one command per frame.)
+            if columns:
+                column_indices = " ".join(map(str, range(columns)))
+                script.append(f"grid columnconfigure {frame} {{{column_indices}}} -weight 1")
+
+            if frame in treeview_frames:
+                # Don't allow the scrollbars to expand horizontally
+                script.append(f"grid columnconfigure {frame} {columns - 1} -weight 0")
+                # Allow the treeviews to expand vertically
+                script.append(f"grid rowconfigure {frame} 0 -weight 1")
 
         # Allow the bottom left frame buttons to group together on the left
-        self.frames["bottom_left"].grid_columnconfigure(0, weight=0)
+        script.append(f"grid columnconfigure {self.frames['bottom_left']} 0 -weight 0")
+
+        self.tk.eval("\n".join(script))
 
     def configure_style(self) -> None:
         """
@@ -359,17 +449,38 @@ class FuzzyUI(tk.Tk):
 
         # Configure Treeview style for larger row height and centered column text
         style = ttk.Style(self)
-        style.configure("Treeview", rowheight=25)
+        style.configure("Treeview", rowheight=_TREEVIEW_ROW_HEIGHT)
         style.configure("Treeview.Item", anchor="center")
 
     def on_window_resize(self, event) -> None:
         """
         Handles window resize events, resizing Treeview columns and text wrap lengths accordingly.
 
+        Dragging the window edge sends a stream of events, so the resizing is only done once they stop for a moment.
+
         Args:
             event: The resize event object.
         """
 
+        # The binding on the main window also receives the Configure events of every widget inside it
+        if event.widget is not self:
+            return
+
+        # Moving the window also sends Configure events, without changing its size
+        if (event.width, event.height) == self.window_dimensions:
+            return
+        self.window_dimensions = (event.width, event.height)
+
+        if self.resize_job is not None:
+            self.after_cancel(self.resize_job)
+        self.resize_job = self.after(_RESIZE_DEBOUNCE_MS, self.resize_widgets)
+
+    def resize_widgets(self) -> None:
+        """
+        Resizes Treeview columns and text wrap lengths to fit the current window size.
+        """
+
+        self.resize_job = None
         self.resize_treeview_columns()
         self.resize_text_wraplength()
 
@@ -378,12 +489,13 @@ class FuzzyUI(tk.Tk):
         Adjusts the wrap length of text in labels, buttons, and radio buttons when the main window is resized.
         """
 
-        for frame in self.winfo_children():
-            for widget in frame.winfo_children():
-                if isinstance(widget, (tk.Label, tk.Button, tk.Radiobutton)):
-                    # Extra added to make it slightly less eager to resize
-                    width = widget.winfo_width() + 10
-                    widget.configure(wraplength=width)
+        for widget in self.text_widgets:
+            # Extra added to make it slightly less eager to resize
+            width = widget.winfo_width() + 10
+            # Setting it again to the same value would still make Tk lay the widget out again
+            if self.applied_wraplengths.get(widget) != width:
+                widget.configure(wraplength=width)
+                self.applied_wraplengths[widget] = width
 
     def resize_treeview_columns(self) -> None:
         """
@@ -392,27 +504,28 @@ class FuzzyUI(tk.Tk):
         Each column after the first one is set to 1/6th the total treeview width, and the first one takes the remaining space.
         """
 
-        for frame in self.winfo_children():
-            for widget in frame.winfo_children():
-                if isinstance(widget, ttk.Treeview):
-                    treeview = widget
-                    treeview_width = treeview.winfo_width()
-
-                    num_columns = len(treeview["columns"])
-                    if num_columns > 1:
-                        # Each column after the first one is set to 1/6th the total treeview width
-                        # The first one takes the remaining space.
-                        secondary_column_width = treeview_width // 6
-                        first_column_width = treeview_width - (
-                            secondary_column_width * (num_columns - 1)
-                        )
-
-                        treeview.column(treeview["columns"][0], width=first_column_width)
-                        for col in treeview["columns"][1:]:
-                            treeview.column(col, minwidth=50, width=secondary_column_width)
-                    else:
-                        # If there is only one column, it should take all the space
-                        treeview.column(treeview["columns"][0], width=treeview_width)
+        for treeview in self.treeviews:
+            treeview_width = treeview.winfo_width()
+            # The column widths only depend on the Treeview width, so they are already right if it hasn't changed
+            if self.applied_treeview_widths.get(treeview) == treeview_width:
+                continue
+            self.applied_treeview_widths[treeview] = treeview_width
+
+            # Read the columns once, since each lookup is a Tcl call
+            columns = treeview["columns"]
+            num_columns = len(columns)
+            if num_columns > 1:
+                # Each column after the first one is set to 1/6th the total treeview width
+                # The first one takes the remaining space.
+                secondary_column_width = treeview_width // 6
+                first_column_width = treeview_width - (secondary_column_width * (num_columns - 1))
+
+                treeview.column(columns[0], width=first_column_width)
+                for col in columns[1:]:
+                    treeview.column(col, minwidth=50, width=secondary_column_width)
+            else:
+                # If there is only one column, it should take all the space
+                treeview.column(columns[0], width=treeview_width)
 
     ### ----------------------- Display Management ----------------------- ###
     def display_fuzzy_match_results(self, processed_results: pd.DataFrame) -> None:
@@ -424,14 +537,18 @@ class FuzzyUI(tk.Tk):
                 Expected to contain 'response', 'score', and 'count' columns.
         """
 
-        logger.info("Displaying fuzzy match results")
-        for item in self.match_results_tree.get_children():
-            self.match_results_tree.delete(item)
-
-        for _, row in processed_results.iterrows():
-            self.match_results_tree.insert(
-                "", "end", values=(row["response"], row["score"], row["count"])
-            )
+        logger.debug("Displaying %s fuzzy match results", len(processed_results))
+        self.populate_treeview(
+            self.match_results_tree,
+            # Each column is converted to Python objects in one go, rather than pandas building each row
+            list(
+                zip(
+                    processed_results["response"].tolist(),
+                    processed_results["score"].tolist(),
+                    processed_results["count"].tolist(),
+                )
+            ),
+        )
 
     def display_category_results(
         self, category: str, responses_and_counts: list[Tuple[str, int]]
@@ -444,12 +561,8 @@ class FuzzyUI(tk.Tk):
             responses_and_counts (list[Tuple[str, int]]): A list of tuples, each containing a response and the count of occurances.
         """
 
-        logger.info("Displaying category results")
-        for item in self.category_results_tree.get_children():
-            self.category_results_tree.delete(item)
-
-        for response, count in responses_and_counts:
-            self.category_results_tree.insert("", "end", values=(response, count))
+        logger.debug("Displaying %s results for category: %s", len(responses_and_counts), category)
+        self.populate_treeview(self.category_results_tree, responses_and_counts)
 
         self.category_results_label.config(text=f"Results for Category: {category}")
 
@@ -462,17 +575,160 @@ class FuzzyUI(tk.Tk):
                 count of responses, and the percentage as a string.
         """
 
-        logger.info("Displaying categories and metrics")
+        logger.debug("Displaying %s categories and metrics", len(formatted_categories_metrics))
         selected_categories = self.selected_categories()
 
-        for item in self.categories_tree.get_children():
-            self.categories_tree.delete(item)
-
-        for category, count, percentage_str in formatted_categories_metrics:
-            self.categories_tree.insert("", "end", values=(category, count, percentage_str))
+        self.populate_treeview(self.categories_tree, formatted_categories_metrics)
 
         self.update_treeview_selections(selected_categories=selected_categories)
 
+    def populate_treeview(self, treeview: ttk.Treeview, rows: list[Tuple]) -> None:
+        """
+        Replaces the rows of a Treeview.
+
+        Only the rows that fit in the Treeview are inserted straight away. The rest are inserted in batches while the UI
+        is idle, so displaying tens of thousands of rows doesn't freeze the UI until every row has been inserted.
+
+        If only a few rows have changed since the Treeview was last populated, such as after categorizing some responses,
+        just those rows are updated in place. Either way, its selection is cleared as repopulating would.
+
+        Args:
+            treeview (ttk.Treeview): The Treeview to populate.
+            rows (list[Tuple]): The values of each row, in display order.
+        """
+
+        self.pending_treeview_selections.pop(treeview, None)
+
+        previous_rows = self.treeview_rows.get(treeview)
+        self.treeview_rows[treeview] = rows
+        if rows == previous_rows or (
+            previous_rows is not None
+            and treeview not in self.treeview_population_jobs
+            and self.update_treeview_rows(treeview, previous_rows, rows)
+        ):
+            treeview.selection_set()
+            return
+
+        # Stop populating the Treeview with any rows from a previous display
+        if job := self.treeview_population_jobs.pop(treeview, None):
+            self.after_cancel(job)
+
+        # Delete every row in one call, without passing their ids through Python
+        self.tk.eval(f"{treeview} delete [{treeview} children {{}}]")
+        self.treeview_values[treeview] = {}
+
+        visible_row_count = treeview.winfo_height() // _TREEVIEW_ROW_HEIGHT + 1
+        self.insert_treeview_rows(treeview, rows, 0, visible_row_count)
+
+    def update_treeview_rows(
+        self, treeview: ttk.Treeview, previous_rows: list[Tuple], rows: list[Tuple]
+    ) -> bool:
+        """
+        Updates the rows of a fully populated Treeview in place, only deleting, inserting and changing the rows that differ.
+
+        Rows are matched up by the value in their first column. This is only done when those values are unique, the rows
+        that are kept are still in the same order, and few enough rows have changed that it is quicker than repopulating.
+
+        Args:
+            treeview (ttk.Treeview): The Treeview to update.
+            previous_rows (list[Tuple]): The rows the Treeview currently has, in display order.
+            rows (list[Tuple]): The new values of each row, in display order.
+
+        Returns:
+            bool: Whether the Treeview was updated. If not, it has been left as it was.
+        """
+
+        previous_rows_by_value = {values[0]: values for values in previous_rows}
+        rows_by_value = {values[0]: values for values in rows}
+        if len(previous_rows_by_value) != len(previous_rows) or len(rows_by_value) != len(rows):
+            return False
+
+        # Rows can only be inserted and deleted around the others, not moved
+        kept_values = [values[0] for values in rows if values[0] in previous_rows_by_value]
+        if kept_values != [values[0] for values in previous_rows if values[0] in rows_by_value]:
+            return False
+
+        changed_rows = [
+            (index, values)
+            for index, values in enumerate(rows)
+            if previous_rows_by_value.get(values[0]) != values
+        ]
+        deleted_count = len(previous_rows) - len(kept_values)
+        if deleted_count + len(changed_rows) > _TREEVIEW_MAX_IN_PLACE_CHANGES:
+            return False
+
+        item_values = self.treeview_values[treeview]
+        items_by_value = {value: item for item, value in item_values.items()}
+
+        if deleted_count:
+            deleted_items = [
+                items_by_value[value]
+                for value in previous_rows_by_value
+                if value not in rows_by_value
+            ]
+            treeview.delete(*deleted_items)
+            for item in deleted_items:
+                del item_values[item]
+
+        # The rows before each index are already in place, so new rows can be inserted at their index
+        for index, values in changed_rows:
+            if values[0] in previous_rows_by_value:
+                treeview.item(items_by_value[values[0]], values=tuple(map(str, values)))
+            else:
+                item = treeview.insert("", index, values=tuple(map(str, values)))
+                item_values[item] = values[0]
+
+        return True
+
+    def insert_treeview_rows(
+        self, treeview: ttk.Treeview, rows: list[Tuple], start: int, stop: int
+    ) -> None:
+        """
+        Inserts a batch of rows into a Treeview, selecting any whose value is waiting to be selected.
+        If there are rows left, schedules the next batch for when the UI is next idle.
+
+        The whole batch is passed to Tcl as one list and inserted by a single `lmap` loop, rather than calling `insert`
+        for each row, which crosses from Python to Tcl and parses its options every time. The rows are converted to
+        Tcl lists in C by tkinter, so there is no quoting to do in Python, and Tcl compiles the loop body once.
+
+        Args:
+            treeview (ttk.Treeview): The Treeview being populated.
+            rows (list[Tuple]): The values of each row, in display order.
+            start (int): The index of the first row in the batch.
+            stop (int): The index after the last row in the batch.
+        """
+
+        batch = rows[start:stop]
+        # Values are displayed as their string form, as insert would display them
+        batch_values = tuple(tuple(map(str, values)) for values in batch)
+        # Evaluates to the list of the inserted items' ids
+        items = self.tk.splitlist(
+            self.tk.call(
+                "lmap", "values", batch_values, f"{treeview} insert {{}} end -values $values"
+            )
+        )
+
+        item_values = {item: values[0] for item, values in zip(items, batch)}
+        self.treeview_values[treeview].update(item_values)
+
+        if pending_selection := self.pending_treeview_selections.get(treeview):
+            if selected_items := [
+                item for item, value in item_values.items() if value in pending_selection
+            ]:
+                treeview.selection_add(*selected_items)
+
+        if stop < len(rows):
+            self.treeview_population_jobs[treeview] = self.after_idle(
+                self.insert_treeview_rows,
+                treeview,
+                rows,
+                stop,
+                stop + _TREEVIEW_INSERT_BATCH_SIZE,
+            )
+        else:
+            self.treeview_population_jobs.pop(treeview, None)
+            self.pending_treeview_selections.pop(treeview, None)
+
     def set_categorization_type_label(self) -> None:
         """
         Sets `categorization_type_label` to reflect the current value of the `categorization_type` variable.
@@ -482,6 +738,37 @@ class FuzzyUI(tk.Tk):
         chosen_type = self.categorization_type.get()
         self.categorization_label.config(text="Categorization Type: " + chosen_type)
 
+    ### ----------------------- Busy state ----------------------- ###
+    def hold_busy(self) -> None:
+        """
+        Makes the buttons, entries, slider and checkbox ignore input while a background task is running,
+        and shows a busy cursor over them.
+
+        The mainloop keeps running, so the window is still redrawn and resized, and the Treeviews can still be scrolled.
+        """
+
+        for position in _INPUT_FRAME_POSITIONS:
+            self.tk.call("tk", "busy", "hold", self.frames[position])
+
+        # Key presses aren't blocked by tk busy, so the entries and checkbox are disabled, which also keeps Tab
+        # traversal out of them, and the focus is moved off them
+        self.match_string_entry.state(["disabled"])
+        self.new_category_entry.state(["disabled"])
+        self.include_missing_data_checkbox.config(state="disabled")
+        self.focus_set()
+
+    def release_busy(self) -> None:
+        """
+        Makes the buttons, entries, slider and checkbox take input again once a background task has finished.
+        """
+
+        for position in _INPUT_FRAME_POSITIONS:
+            self.tk.call("tk", "busy", "forget", self.frames[position])
+
+        self.match_string_entry.state(["!disabled"])
+        self.new_category_entry.state(["!disabled"])
+        self.include_missing_data_checkbox.config(state="normal")
+
     ### ----------------------- Popups ----------------------- ###
     def create_popup(self, title: str) -> tk.Toplevel:
         """
@@ -498,54 +785,101 @@ class FuzzyUI(tk.Tk):
         popup.title(title)
 
         # Center the popup on the main window
-        self.POPUP_WIDTH = "400"
-        self.POPUP_HEIGHT = "200"
-        popup.geometry(f"{self.POPUP_WIDTH}x{self.POPUP_HEIGHT}+{self.centre_x}+{self.centre_y}")
+        popup.geometry(self.popup_geometry)
+        self.show_popup(popup)
+
+        return popup
+
+    def show_popup(self, popup: tk.Toplevel) -> None:
+        """
+        Shows a popup window on top of the main window, directing all events to it until it is closed.
+
+        Args:
+            popup (tk.Toplevel): The popup window.
+        """
 
         # Keep the popup window on top
         # Ensure all events are directed to this window until closed
         # Set focus on this popup so that you can straight away press enter
-        popup.transient(self)
-        popup.grab_set()
-        popup.focus_set()
+        # (One Tcl script rather than a call for each.)
+        self.tk.eval(
+            f"wm transient {popup} {self}; wm deiconify {popup}; grab set {popup}; focus {popup}"
+        )
 
-        return popup
+    def hide_popup(self, popup: tk.Toplevel) -> None:
+        """
+        Hides a popup window and releases its grab, so it can be shown again later without being recreated.
+
+        Args:
+            popup (tk.Toplevel): The popup window.
+        """
+
+        popup.grab_release()
+        popup.withdraw()
 
     def create_rename_category_popup(self, old_category: str) -> None:
         """
         Creates a popup window for renaming a category.
 
+        The popup is only created the first time. Closing it hides it, and later renames show it again,
+        rather than creating all of its widgets again.
+
         Args:
             old_category (str): The name of the category to be renamed.
         """
 
-        logger.info("Creating rename category popup")
-        self.rename_dialog_popup = self.create_popup("Rename Category")
-
-        # Create widgets
-        self.label = tk.Label(
-            self.rename_dialog_popup, text=f"Enter a new name for '{old_category}':"
-        )
-        self.rename_category_entry = tk.Entry(self.rename_dialog_popup)
-        self.ok_button = tk.Button(self.rename_dialog_popup, text="OK")
-        self.cancel_button = tk.Button(self.rename_dialog_popup, text="Cancel")
-
-        # Add widgets to popup
-        self.label.pack(pady=10)
-        self.rename_category_entry.pack()
-        self.ok_button.pack(side="left", padx=20)
-        self.cancel_button.pack(side="right", padx=20)
+        if self.rename_dialog_popup is None:
+            logger.info("Creating rename category popup")
+            self.rename_dialog_popup = self.create_popup("Rename Category")
+            # Closing the window with the title bar button hides it, like the cancel button
+            self.rename_dialog_popup.protocol("WM_DELETE_WINDOW", self.close_rename_category_popup)
+
+            # Create widgets
+            self.label = tk.Label(self.rename_dialog_popup)
+            self.rename_category_entry = ttk.Entry(self.rename_dialog_popup)
+            self.ok_button = tk.Button(self.rename_dialog_popup, text="OK")
+            self.cancel_button = tk.Button(self.rename_dialog_popup, text="Cancel")
+
+            # Add widgets to popup
+            self.label.pack(pady=10)
+            self.rename_category_entry.pack()
+            self.ok_button.pack(side="left", padx=20)
+            self.cancel_button.pack(side="right", padx=20)
+        else:
+            logger.info("Showing rename category popup")
+            self.show_popup(self.rename_dialog_popup)
+
+        self.label.configure(text=f"Enter a new name for '{old_category}':")
+        self.rename_category_entry.delete(0, "end")
 
         # Set focus to the string entry
         self.rename_category_entry.focus_set()
 
+    def close_rename_category_popup(self) -> None:
+        """
+        Hides the rename category popup, ready to be shown again for the next rename.
+        """
+
+        logger.info("Closing rename category popup")
+        self.hide_popup(self.rename_dialog_popup)
+
     def create_ask_categorization_type_popup(self):
         """
         Creates a popup window that allows the user to select the categorization type (Single or Multi).
+
+        The popup is only created the first time. Closing it hides it, and later new projects show it again.
         """
 
+        if self.categorization_type_popup is not None:
+            logger.info("Showing categorization type popup")
+            self.show_popup(self.categorization_type_popup)
+            return
+
         logger.info("Creating categorization type popup")
         self.categorization_type_popup = self.create_popup("Select Categorization Type")
+        self.categorization_type_popup.protocol(
+            "WM_DELETE_WINDOW", lambda: self.hide_popup(self.categorization_type_popup)
+        )
 
         # Create buttons that assign value to self.categoriztation_type
         single_categorization_rb = tk.Radiobutton(
@@ -568,7 +902,7 @@ class FuzzyUI(tk.Tk):
         # Functions to execute upon confirm/Enter
         def _on_confirm():
             self.set_categorization_type_label()
-            self.categorization_type_popup.destroy()
+            self.hide_popup(self.categorization_type_popup)
 
         # Bind widgets to commands
         self.confirm_button.bind("<Button-1>", lambda event: _on_confirm())
@@ -667,10 +1001,7 @@ class FuzzyUI(tk.Tk):
             set[str]: The selected responses.
         """
 
-        return {
-            self.match_results_tree.item(item_id)["values"][0]
-            for item_id in self.match_results_tree.selection()
-        }
+        return self.selected_values(self.match_results_tree)
 
     def selected_category_responses(self) -> set[str]:
         """
@@ -680,10 +1011,7 @@ class FuzzyUI(tk.Tk):
             set[str]: The selected responses.
         """
 
-        return {
-            self.category_results_tree.item(item_id)["values"][0]
-            for item_id in self.category_results_tree.selection()
-        }
+        return self.selected_values(self.category_results_tree)
 
     def selected_categories(self) -> set[str]:
         """
@@ -693,30 +1021,56 @@ class FuzzyUI(tk.Tk):
             set[str]: The selected categories.
         """
 
-        return {
-            self.categories_tree.item(item_id)["values"][0]
-            for item_id in self.categories_tree.selection()
-        }
+        return self.selected_values(self.categories_tree)
+
+    def selected_values(self, treeview: ttk.Treeview) -> set[str]:
+        """
+        Returns the values in the first column of the selected items in a Treeview.
+
+        The values are looked up in `treeview_values`, rather than asking Tcl for each item's values.
+        This also returns them exactly as they were displayed, where Tcl would turn responses like "123" into numbers.
+
+        Args:
+            treeview (ttk.Treeview): The Treeview to get the selection from.
+
+        Returns:
+            set[str]: The selected values.
+        """
+
+        item_values = self.treeview_values.get(treeview, {})
+        return {item_values[item_id] for item_id in treeview.selection()}
 
     def update_treeview_selections(
-        self, selected_categories: set[str] = set(), selected_responses: set[str] = set()
+        self,
+        selected_categories: set[str] | None = None,
+        selected_responses: set[str] | None = None,
     ) -> None:
         """
         Updates the selections in Treeview widgets based on specified criteria.
 
         Args:
-            selected_categories (set[str], optional): A set of category names to be re-selected in the `categories_tree`.
-            selected_responses (set[str], optional): A set of responses to be re-selected in the `match_results_tree`
-                if categorization_type is 'Multi'.
+            selected_categories (set[str] | None, optional): A set of category names to be re-selected in the `categories_tree`.
+                Defaults to None, leaving its selection as it is.
+            selected_responses (set[str] | None, optional): A set of responses to be re-selected in the `match_results_tree`
+                if categorization_type is 'Multi'. Defaults to None, leaving its selection as it is.
         """
 
         def reselect_treeview_items(treeview, values):
-            for item in treeview.get_children():
-                if treeview.item(item)["values"][0] in values:
-                    treeview.selection_add(item)
+            # Select all of the items in one call, rather than one call per item
+            treeview.selection_set(
+                [
+                    item
+                    for item, value in self.treeview_values.get(treeview, {}).items()
+                    if value in values
+                ]
+            )
+
+            # Rows that haven't been inserted yet are selected as they are inserted
+            if treeview in self.treeview_population_jobs:
+                self.pending_treeview_selections[treeview] = values
 
         # Re-select categories and if multi-categorization re-select match results
-        logger.info("Updating treeview selections")
+        logger.debug("Updating treeview selections")
         if selected_categories is not None:
             reselect_treeview_items(self.categories_tree, selected_categories)
         if self.categorization_type.get() == "Multi" and selected_responses is not None:
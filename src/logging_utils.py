@@ -1,7 +1,7 @@
 """
 This module provides utility functions for logging and debugging within the application.
 
-Logs are written to 'app.log' file in the project root directory.
+Logs are written to 'app.log' file in the project root directory, by a background thread so the UI never waits on the file.
 
 Functions:
     - setup_logging: Configures the logging settings for the application.
@@ -9,36 +9,95 @@ Functions:
     
 Main dependencies:
     - pandas: for data manipulation
-    - inspect: for formatting log messages
 
 Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
+import time
+from itertools import islice
 from typing import Any
 import pandas as pd
-import inspect
+
+# Set this environment variable to log the head of DataFrames, rather than a summary of their shape and columns
+_LOG_DATAFRAME_HEAD_ENV_VAR = "FUZZY_LOG_DF_HEAD"
+
+# Log records are written to the file in batches of this many, or straight away for warnings and errors
+_LOG_WRITE_BATCH_SIZE = 100
+
+# How many columns to show when logging a DataFrame
+_DATAFRAME_SUMMARY_COLUMN_LIMIT = 10
 
 
 def setup_logging():
     """
     Initializes logging with a specified format, log level, and output file. Logs are written to 'app.log' file.
     Also supresses noisy libraries.
+
+    Records are passed through a queue to a listener thread that writes them to the file, so logging on the UI thread
+    doesn't wait on file IO. The listener buffers records and writes them in batches, writing straight away for
+    warnings and errors, and only opens the file when it first writes to it. At exit, the listener is stopped and
+    anything still queued or buffered is written.
     """
 
+    file_handler = logging.FileHandler("app.log", mode="w", delay=True)
+    file_handler.setFormatter(
+        _CachedTimeFormatter("%(asctime)s - %(filename)s:%(lineno)d - %(levelname)s - %(message)s")
+    )
+    buffer_handler = logging.handlers.MemoryHandler(
+        _LOG_WRITE_BATCH_SIZE, flushLevel=logging.WARNING, target=file_handler
+    )
+    log_queue = queue.SimpleQueue()
+    listener = logging.handlers.QueueListener(log_queue, buffer_handler)
+    listener.start()
+    # Exit handlers run in reverse, so the listener is stopped before the buffer is written out
+    atexit.register(buffer_handler.close)
+    atexit.register(listener.stop)
+
+    # The queue handler only fills in the message, the file handler adds the rest of the format
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s - %(filename)s:%(lineno)d - %(levelname)s - %(message)s",
-        filename="app.log",
-        filemode="w",
+        format="%(message)s",
+        handlers=[logging.handlers.QueueHandler(log_queue)],
     )
 
+    # The log format doesn't show which thread or process a record came from, so don't look them up for every record
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+
     # Suppressing noisy libraries
     logging.getLogger("chardet").setLevel(logging.WARNING)
 
     logging.info("Logging initialized")
 
 
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    A log formatter that only formats the date and time once per second, rather than for every record.
+    The milliseconds are still filled in for each record, so timestamps look the same as `logging.Formatter`'s.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.cached_second: int | None = None
+        self.cached_time = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: str | None = None) -> str:
+        if datefmt:
+            return super().formatTime(record, datefmt)
+
+        second = int(record.created)
+        if second != self.cached_second:
+            self.cached_second = second
+            self.cached_time = time.strftime(self.default_time_format, self.converter(second))
+        return self.default_msec_format % (self.cached_time, record.msecs)
+
+
 def format_and_log_data_for_debug(logger: logging.Logger, attributes: dict[str, Any]) -> None:
     """
     Formats various types of class attributes and logs them for debugging purposes.
@@ -48,7 +107,8 @@ def format_and_log_data_for_debug(logger: logging.Logger, attributes: dict[str,
         attributes (dict[str, Any]): A dictionary containing the attribute names and their values from a class instance.
 
     The method inspects each attribute and decides on a logging format based on its data type:
-        - For pandas DataFrames, it logs the head of the DataFrame.
+        - For pandas DataFrames, it logs the shape and the first few column names,
+          or the head of the DataFrame if the `FUZZY_LOG_DF_HEAD` environment variable is set.
         - For dictionaries:
             - If dictionary where values are types, it show everything.
             - If dictionary where keys have more than 10 values, it show keys and counts of values.
@@ -58,33 +118,61 @@ def format_and_log_data_for_debug(logger: logging.Logger, attributes: dict[str,
     Usage:
         Can be used on specific variables, or can be used on all class attributes of a data model, like so:
         `logging_utils.format_and_log_data_for_debug(logger, vars(self))`
+
+        Nothing is formatted if the logger isn't logging debug messages.
+    """
+
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
+
+    # The QueueHandler formats records on this thread as it queues them, not on the listener thread, so the guard
+    # above is what saves formatting the attributes when debug messages aren't logged
+    logger.debug("%s", _AttributesMessage(attributes))
+
+
+class _AttributesMessage:
+    """
+    A log message argument that formats attributes for `format_and_log_data_for_debug` when it is converted to a string.
     """
 
-    log_messages = ["Class attributes:\n"]
-    for name, obj in attributes.items():
-        if isinstance(obj, pd.DataFrame):
-            # Handling dataframes, show head
-            log_message = f"{name} (head):\n{obj.head()}"
-        elif isinstance(obj, dict):
-            if all(isinstance(v, type) for v in obj.values()):
-                # Handling dictionaries of types, show all
-                type_dict = dict(obj.items())
-                log_message = f"{name} (dictionary of types):\n{type_dict}"
-            elif any(len(v) > 10 for v in obj.values() if isinstance(v, (list, set, tuple, dict))):
-                # For dictionaries whose keys have many values, show keys and their value counts
-                summarized_dict = {
-                    k: len(v) if isinstance(v, (list, set, tuple, dict)) else "Non-collection"
-                    for k, v in obj.items()
-                }
-                log_message = f"{name} (some keys have many values, showing keys and counts):\n{summarized_dict}"
+    def __init__(self, attributes: dict[str, Any]) -> None:
+        self.attributes = attributes
+
+    def __str__(self) -> str:
+        log_messages = ["Class attributes:\n"]
+        for name, obj in self.attributes.items():
+            if isinstance(obj, pd.DataFrame):
+                if os.environ.get(_LOG_DATAFRAME_HEAD_ENV_VAR):
+                    # Handling dataframes, show head
+                    # (to_string with a column limit doesn't measure the terminal width like repr does.)
+                    head = obj.head().to_string(max_cols=_DATAFRAME_SUMMARY_COLUMN_LIMIT)
+                    log_message = f"{name} (head):\n{head}"
+                else:
+                    # Formatting the head is slow for wide dataframes, so by default just summarize them
+                    columns = list(obj.columns[:_DATAFRAME_SUMMARY_COLUMN_LIMIT])
+                    log_message = f"{name} (dataframe): shape={obj.shape} columns={columns}"
+            elif isinstance(obj, dict):
+                if all(isinstance(v, type) for v in obj.values()):
+                    # Handling dictionaries of types, show all
+                    type_dict = dict(obj.items())
+                    log_message = f"{name} (dictionary of types):\n{type_dict}"
+                elif any(
+                    len(v) > 10 for v in obj.values() if isinstance(v, (list, set, tuple, dict))
+                ):
+                    # For dictionaries whose keys have many values, show keys and their value counts
+                    summarized_dict = {
+                        k: len(v) if isinstance(v, (list, set, tuple, dict)) else "Non-collection"
+                        for k, v in obj.items()
+                    }
+                    log_message = f"{name} (some keys have many values, showing keys and counts):\n{summarized_dict}"
+                else:
+                    # For other dictionaries, show the first few items
+                    limit = 5
+                    dict_head = dict(islice(obj.items(), limit))
+                    log_message = f"{name} (first {limit} items):\n{dict_head}"
             else:
-                # For other dictionaries, show the first few items
-                limit = 5
-                dict_head = dict(list(obj.items())[:limit])
-                log_message = f"{name} (first {limit} items):\n{dict_head}"
-        else:
-            log_message = f"{name}:\n{obj}"
+                log_message = f"{name}:\n{obj}"
 
-        log_messages.append(inspect.cleandoc(log_message) + "\n")
+            log_messages.append(log_message + "\n")
 
-    logger.debug("\n".join(log_messages))
+        return "\n".join(log_messages)
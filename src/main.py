@@ -15,14 +15,16 @@ Author: Louie Atkins-Turkish (louie@tapestryresearch.com)
 """
 
 import logging
-from controller import Controller
-from fuzzy_ui import FuzzyUI
-from data_model import DataModel
-from file_handler import FileHandler
 from logging_utils import setup_logging
 
 
 def main():
+    # Imported once logging is set up, so anything logged while importing them is kept
+    from controller import Controller
+    from fuzzy_ui import FuzzyUI
+    from data_model import DataModel
+    from file_handler import FileHandler
+
     logger = logging.getLogger(__name__)
     logger.info("Application starting")
     file_handler = FileHandler()
@@ -6,12 +6,9 @@ from src.data_model import DataModel
 
 
 ### ----------------------- Setup data_model with mock data ----------------------- ###
-@pytest.fixture(scope="function", autouse=True)
-def mock_data_model():
-    file_handler = FileHandler()
-    data_model = DataModel(file_handler)
-
-    mock_data = pd.DataFrame(
+@pytest.fixture(scope="session")
+def mock_data():
+    return pd.DataFrame(
         {
             "uuid": [str(uuid.uuid4()) for _ in range(5)],
             "response_1": ["Test1", pd.NA, "First response for third person", pd.NA, "Hello"],
@@ -20,7 +17,14 @@ def mock_data_model():
         }
     )
 
-    data_model.raw_data = mock_data
+
+@pytest.fixture(scope="function", autouse=True)
+def mock_data_model(mock_data):
+    file_handler = FileHandler()
+    data_model = DataModel(file_handler)
+
+    # Each test gets its own copy, so changes to the data don't leak between tests
+    data_model.raw_data = mock_data.copy()
     data_model.populate_data_structures_on_new_project()
 
     return data_model
@@ -152,3 +156,62 @@ def test_recategorize_responses(
     to_category_count = len(mock_data_model.categorized_dict[to_category])
     assert from_category_count == expected_counts[from_category]
     assert to_category_count == expected_counts[to_category]
+
+
+@pytest.mark.parametrize(
+    "string_to_match, expected_top_response, expected_top_score",
+    [
+        ("hello", "hello", 100),
+        ("Second response for third person", "second response for third person", 100),
+    ],
+)
+def test_fuzzy_match_logic(
+    mock_data_model, string_to_match, expected_top_response, expected_top_score
+):
+    success, _ = mock_data_model.fuzzy_match_logic(string_to_match)
+    assert success
+
+    results = mock_data_model.process_fuzzy_match_results(threshold_value=0)
+    assert results.iloc[0]["response"] == expected_top_response
+    assert results.iloc[0]["score"] == expected_top_score
+    # Missing data is never matched against
+    assert results["response"].notna().all()
+
+
+def test_fuzzy_match_rounds_scores_half_to_even(mock_data_model):
+    # WRatio scores this 62.5, which thefuzz rounded to 62
+    results = mock_data_model.fuzzy_match({"e abdce dc"}, "abc de", score_cutoff=63)
+    assert results.empty
+
+    results = mock_data_model.fuzzy_match({"e abdce dc"}, "abc de")
+    assert results.iloc[0]["score"] == 62
+
+
+def test_category_columns_dtype(mock_data_model):
+    mock_data_model.create_category("NewCategory")
+    mock_data_model.categorize_responses({"hello"}, {"NewCategory"}, "Single")
+
+    category_columns = mock_data_model.categorized_data.columns[
+        1 + len(mock_data_model.response_columns) :
+    ]
+    assert (mock_data_model.categorized_data[category_columns].dtypes == "UInt8").all()
+    # Missing data is kept as NA rather than upcasting the columns
+    assert mock_data_model.categorized_data["NewCategory_response_2"].isna().sum() == 3
+    assert mock_data_model.categorized_data["NewCategory_response_1"].sum() == 1
+
+
+def test_category_counts_kept_up_to_date(mock_data_model):
+    mock_data_model.create_category("Category1")
+    mock_data_model.create_category("Category2")
+    mock_data_model.categorize_responses({"test1", "hello"}, {"Category1"}, "Single")
+    mock_data_model.currently_displayed_category = "Category1"
+    mock_data_model.recategorize_responses({"hello"}, {"Category2"})
+    mock_data_model.rename_category("Category2", "Renamed")
+    mock_data_model.delete_categories({"Category1"}, "Single")
+
+    expected_counts = {
+        category: mock_data_model.sum_response_counts(responses)
+        for category, responses in mock_data_model.categorized_dict.items()
+    }
+    assert mock_data_model.category_counts == expected_counts
+    assert mock_data_model.category_counts["Renamed"] == 1
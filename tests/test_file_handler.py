@@ -1,7 +1,7 @@
 import pytest
 import pandas as pd
 import os
-import chardet
+import codecs
 import json
 from src.file_handler import FileHandler
 
@@ -17,9 +17,10 @@ def example_csv_file(tmpdir):
     return str(path)
 
 
-@pytest.fixture
-def example_xlsx_file(tmpdir):
-    path = os.path.join(tmpdir, "data.xlsx")
+# Writing xlsx files is slow and no test changes them, so they are only written once
+@pytest.fixture(scope="session")
+def example_xlsx_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "data.xlsx"
     example_dataframe = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
     example_dataframe.to_excel(path, index=False)
     return str(path)
@@ -32,9 +33,9 @@ def empty_csv_file(tmpdir):
     return str(path)
 
 
-@pytest.fixture
-def empty_xlsx_file(tmpdir):
-    path = os.path.join(tmpdir, "empty.xlsx")
+@pytest.fixture(scope="session")
+def empty_xlsx_file(tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "empty.xlsx"
     pd.DataFrame().to_excel(path, index=False)
     return str(path)
 
@@ -111,6 +112,28 @@ def test_load_json(test_file, expected_data, expect_exception, request):
         assert data == expected_data
 
 
+@pytest.mark.parametrize(
+    "test_dataframe",
+    [
+        pd.DataFrame({"uuid": [1, 2, 3], "category": pd.array([1, pd.NA, 0], dtype="Int8")}),
+        pd.DataFrame({"uuid": ["a1", "b2", "c3"], "response": ["yes", None, " no "]}),
+        pd.DataFrame({"uuid": [1, 2, 3], "category": [1.0, 0.0, float("nan")]}),
+        pd.DataFrame({"uuid": [1, 2, 3], "response": ["a, b", 'say "hi"', "two\nlines"]}),
+        pd.DataFrame({"uuid": [1, 2, 3], "flag": [True, False, True]}),
+        pd.DataFrame({"uuid": [1, 2, 3], "response": ["a", 2, None]}),
+        pd.DataFrame({"response": ["a", "", None]}),
+        pd.DataFrame({"column, with comma": [1, 2, 3], "uuid": [1, 2, 3]}),
+    ],
+)
+def test_export_dataframe_to_csv_matches_to_csv(test_dataframe, tmpdir):
+    file_path = os.path.join(tmpdir, "export.csv")
+
+    file_handler.export_dataframe(file_path, test_dataframe)
+
+    with open(file_path, encoding="utf-8", newline="") as f:
+        assert f.read() == test_dataframe.to_csv(index=False, lineterminator=os.linesep)
+
+
 @pytest.mark.parametrize(
     "test_dataframe, file_path, expected_data, expect_exception",
     [
@@ -137,13 +160,33 @@ def test_export_dataframe_to_csv(
         file_handler.export_dataframe_to_csv(file_path, test_dataframe)
         assert os.path.exists(file_path)
 
-        with open(file_path, "rb") as file:
-            encoding = chardet.detect(file.read())["encoding"]  # Detect encoding
-        data = pd.read_csv(file_path, encoding=encoding)
+        # CSVs are always exported as UTF-8
+        data = pd.read_csv(file_path, encoding="utf-8")
 
         pd.testing.assert_frame_equal(data, expected_data, check_dtype=True)
 
 
+@pytest.mark.parametrize(
+    "extension, read_function",
+    [(".parquet", pd.read_parquet), (".feather", pd.read_feather)],
+)
+def test_export_dataframe_to_binary_formats(extension, read_function, tmpdir):
+    test_dataframe = pd.DataFrame(
+        {"uuid": ["a", "b", "c"], "category": pd.array([1, 0, 1], dtype="UInt8")}, index=[2, 5, 7]
+    )
+    file_path = os.path.join(tmpdir, f"export{extension}")
+
+    file_handler.export_dataframe(file_path, test_dataframe)
+
+    data = read_function(file_path)
+    pd.testing.assert_frame_equal(data, test_dataframe.reset_index(drop=True))
+
+    with pytest.raises(ValueError):
+        file_handler.export_dataframe(os.path.join(tmpdir, "export.txt"), test_dataframe)
+    with pytest.raises(pd.errors.EmptyDataError):
+        file_handler.export_dataframe(file_path, pd.DataFrame())
+
+
 @pytest.mark.parametrize(
     "test_data, file_path, expected_data, expect_exception",
     [
@@ -171,3 +214,220 @@ def test_save_data_to_json(test_data, file_path, expected_data, expect_exception
         with open(file_path, "r") as f:
             data = json.load(f)
         assert data == expected_data
+
+
+@pytest.mark.parametrize(
+    "test_dataframe",
+    [
+        pd.DataFrame(
+            {
+                "uuid": ["a", "b", "c"],
+                "response": pd.Categorical(["x", pd.NA, "y"]),
+                "category": pd.array([1, pd.NA, 0], dtype="UInt8"),
+                "text": ["x", pd.NA, "y"],
+            }
+        ),
+        pd.DataFrame({"mixed": [1, "x", pd.NA]}),  # Not storable as Parquet, falls back to JSON
+    ],
+)
+def test_serialize_and_deserialize_dataframe(test_dataframe):
+    serialized_df = file_handler.serialize_dataframe(test_dataframe)
+    assert isinstance(serialized_df, str)
+
+    data = file_handler.deserialize_dataframe(serialized_df)
+    pd.testing.assert_frame_equal(data, test_dataframe, check_dtype=True)
+
+
+def test_deserialize_legacy_json_dataframe():
+    data = file_handler.deserialize_dataframe('{"col1":{"0":"a","1":null}}')
+
+    assert data["col1"].tolist()[0] == "a"
+    assert data["col1"].tolist()[1] is pd.NA
+
+
+@pytest.mark.parametrize(
+    "content, expected_encoding",
+    [
+        ("col1\nplain text\n".encode("ascii"), "utf-8"),
+        ("col1\ncafé crème brûlée\n".encode("utf-8"), "utf-8"),
+        (b"", "utf-8"),
+        (codecs.BOM_UTF8 + "col1\ncafé\n".encode("utf-8"), "utf-8-sig"),
+        ("col1\ncafé\n".encode("utf-16"), "utf-16"),
+        # Sample ends part way through a multi-byte character
+        ("col1\n".encode("ascii") + "é".encode("utf-8") * 40000, "utf-8"),
+    ],
+)
+def test_detect_encoding(content, expected_encoding, tmpdir):
+    path = os.path.join(tmpdir, "encoded.csv")
+    with open(path, "wb") as f:
+        f.write(content)
+
+    with open(path, "rb") as f:
+        assert file_handler.detect_encoding(f) == expected_encoding
+        assert f.tell() == 0
+
+
+# Files either side of 1 MB, which pyarrow parses in one block or several
+@pytest.mark.parametrize("num_ascii_rows", [5000, 100000])
+def test_read_csv_with_non_ascii_characters_after_the_encoding_sample(num_ascii_rows, tmpdir):
+    path = os.path.join(tmpdir, "data.csv")
+    example_dataframe = pd.DataFrame(
+        {
+            "uuid": range(num_ascii_rows + 1),
+            "q1": ["response"] * num_ascii_rows + ["caf\u00e9"],
+        }
+    )
+    example_dataframe.to_csv(path, index=False, encoding="cp1252")
+
+    data = file_handler.read_csv_or_xlsx_to_dataframe(path)
+
+    pd.testing.assert_frame_equal(data, example_dataframe)
+
+
+_C_PARSER_TEST_ROWS = (
+    "12345678901234567890123,2024-01-01,12:30,1.5,True,,00123,None\n"
+    '2,2024-01-02 13:30,x,,False,,5,"a, ""quoted""\nresponse"\n'
+)
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        "uuid,q1,q2,q3,q4,q5,q6,q7\n" + _C_PARSER_TEST_ROWS,
+        "uuid,q1,q2,q3,q4,q5,q6,q7\n" + _C_PARSER_TEST_ROWS * 20000,
+        # Blank header cell from a trailing delimiter
+        "uuid,q1,\n1,a,\n2,b,\n",
+        # Header only
+        "uuid,q1\n",
+    ],
+)
+def test_read_csv_matches_the_c_parser(content, tmpdir):
+    path = os.path.join(tmpdir, "data.csv")
+    with open(path, "w") as f:
+        f.write(content)
+
+    data = file_handler.read_csv_or_xlsx_to_dataframe(path)
+
+    pd.testing.assert_frame_equal(data, pd.read_csv(path))
+
+
+def test_save_data_to_json_with_handler(tmpdir):
+    file_path = os.path.join(tmpdir, "project.json")
+    test_data = {"counts": {"café": 2, None: 1}, "missing": pd.NA}
+
+    file_handler.save_data_to_json(file_path, test_data, handler=lambda o: None)
+
+    assert file_handler.load_json(file_path) == {"counts": {"café": 2, "null": 1}, "missing": None}
+
+
+def test_load_json_with_nan(tmpdir):
+    # json.dump writes float NaN as a bare NaN, which strict parsers reject
+    path = os.path.join(tmpdir, "nan.json")
+    with open(path, "w") as f:
+        json.dump({"key1": float("nan")}, f)
+
+    data = file_handler.load_json(path)
+    assert pd.isna(data["key1"])
+
+
+def test_read_and_export_csv_in_chunks(tmpdir):
+    source_path = os.path.join(tmpdir, "source.csv")
+    export_path = os.path.join(tmpdir, "export.csv")
+    example_dataframe = pd.DataFrame(
+        {"col1": range(10), "col2": [f"response {i}" for i in range(10)]}
+    )
+    example_dataframe.to_csv(source_path, index=False)
+
+    chunks = file_handler.read_csv_or_xlsx_to_dataframe(source_path, chunksize=3)
+    file_handler.export_dataframe_to_csv(export_path, chunks)
+
+    data = pd.read_csv(export_path)
+    pd.testing.assert_frame_equal(data, example_dataframe, check_dtype=True)
+
+
+def test_save_and_load_compressed_json(tmpdir):
+    file_path = os.path.join(tmpdir, "project.json.zst")
+    test_data = {"key1": "value1", "key2": ["value2"] * 1000}
+
+    file_handler.save_data_to_json(file_path, test_data)
+
+    assert os.path.getsize(file_path) < len(json.dumps(test_data))
+    assert file_handler.load_json(file_path) == test_data
+
+
+def test_failed_export_leaves_existing_file_untouched(tmpdir):
+    export_path = os.path.join(tmpdir, "export.csv")
+    with open(export_path, "w") as f:
+        f.write("previous export\n")
+
+    def failing_chunks():
+        yield pd.DataFrame({"col1": [1, 2]})
+        raise RuntimeError("Reading failed")
+
+    with pytest.raises(RuntimeError):
+        file_handler.export_dataframe_to_csv(export_path, failing_chunks())
+
+    with open(export_path) as f:
+        assert f.read() == "previous export\n"
+    assert os.listdir(tmpdir) == ["export.csv"]
+
+
+def test_read_csv_with_usecols_dtype_and_nrows(tmpdir):
+    file_path = os.path.join(tmpdir, "data.csv")
+    pd.DataFrame({"uuid": [1, 2, 3], "q1": ["a", "b", "c"], "q2": ["x", "y", "z"]}).to_csv(
+        file_path, index=False
+    )
+
+    data = file_handler.read_csv_or_xlsx_to_dataframe(
+        file_path, usecols=["uuid", "q1"], dtype={"uuid": "string"}
+    )
+    expected_data = pd.DataFrame(
+        {"uuid": pd.array(["1", "2", "3"], dtype="string"), "q1": ["a", "b", "c"]}
+    )
+    pd.testing.assert_frame_equal(data, expected_data)
+
+    data = file_handler.read_csv_or_xlsx_to_dataframe(file_path, nrows=2)
+    assert data.shape == (2, 3)
+
+
+def test_read_csv_cache(tmpdir):
+    file_path = os.path.join(tmpdir, "data.csv")
+    pd.DataFrame({"uuid": [1, 2], "q1": ["a", "b"]}).to_csv(file_path, index=False)
+    handler = FileHandler()
+
+    data = handler.read_csv_or_xlsx_to_dataframe(file_path)
+    assert all(data is not cached_df for cached_df, _ in handler.read_cache.values())
+    data.loc[0, "q1"] = "changed"
+
+    # Changing the returned DataFrame doesn't change the cached one
+    cached_data = handler.read_csv_or_xlsx_to_dataframe(file_path)
+    assert cached_data["q1"].tolist() == ["a", "b"]
+    assert len(handler.read_cache) == 1
+
+    # Modifying the file invalidates the cache
+    pd.DataFrame({"uuid": [1, 2, 3], "q1": ["a", "b", "c"]}).to_csv(file_path, index=False)
+    data = handler.read_csv_or_xlsx_to_dataframe(file_path)
+    assert data["q1"].tolist() == ["a", "b", "c"]
+
+
+def test_read_csv_cache_skips_files_too_large_to_keep(tmpdir, monkeypatch):
+    file_path = os.path.join(tmpdir, "data.csv")
+    pd.DataFrame({"uuid": [1, 2], "q1": ["a", "b"]}).to_csv(file_path, index=False)
+    handler = FileHandler()
+    monkeypatch.setattr("src.file_handler._READ_CACHE_MAX_BYTES", 0)
+
+    data = handler.read_csv_or_xlsx_to_dataframe(file_path)
+
+    assert data["q1"].tolist() == ["a", "b"]
+    assert not handler.read_cache
+
+
+def test_file_extensions_are_case_insensitive(tmpdir):
+    file_path = os.path.join(tmpdir, "DATA.CSV")
+    example_dataframe = pd.DataFrame({"uuid": [1, 2], "q1": ["a", "b"]})
+
+    file_handler.export_dataframe(file_path, example_dataframe)
+    data = file_handler.read_csv_or_xlsx_to_dataframe(file_path)
+
+    pd.testing.assert_frame_equal(data, example_dataframe)
+    assert file_handler.check_json_file_path("PROJECT.JSON.ZST")